@@ -1,9 +1,12 @@
 from fastapi import APIRouter
 from .chat import router as chat_router
+from .health import router as health_router
 from .auth import router as auth_router
 from .homework import router as homework_router
+from .jobs import router as jobs_router
 from .lesson import router as lesson_router
 from .materials import router as materials_router
+from .metrics import router as metrics_router
 from .mind_map import router as mind_map_router
 from .session import router as session_router
 from .user import router as user_router
@@ -16,4 +19,6 @@ router.include_router(materials_router)
 router.include_router(chat_router)
 router.include_router(homework_router)
 router.include_router(lesson_router)
-router.include_router(mind_map_router)
\ No newline at end of file
+router.include_router(mind_map_router)
+router.include_router(jobs_router)
+router.include_router(health_router)
\ No newline at end of file
@@ -1,3 +1,34 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
-router = APIRouter(prefix="/chat", tags=["Chat"])
\ No newline at end of file
+from app.core.config import settings
+from app.dto.chat import ChatRequest
+from app.services.chat_service import chat_stats, stream_chat
+from app.utils.sse import stream_with_heartbeat
+
+router = APIRouter(prefix="/chat", tags=["Chat"])
+
+
+@router.post("/stream")
+async def chat_stream(body: ChatRequest, request: Request):
+    """Stream the tutor's reply token by token over server-sent events."""
+    if not body.messages or body.messages[-1].role != "user":
+        raise HTTPException(status_code=400, detail="The last message must come from the user")
+
+    frames = stream_with_heartbeat(
+        request,
+        stream_chat(body),
+        heartbeat=settings.ai.CHAT_HEARTBEAT_SECONDS,
+        buffer=settings.ai.CHAT_STREAM_BUFFER,
+    )
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+async def get_chat_stats():
+    """Request counts, cumulative TTFT and generated tokens."""
+    return chat_stats
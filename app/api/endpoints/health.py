@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.core.database import pool_stats
+from app.services.upstream import upstream
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/db")
+async def get_db_pool_stats():
+    """Connection pool usage, for sizing the pool against the worker count."""
+    return pool_stats()
+
+
+@router.get("/upstream")
+async def get_upstream_stats():
+    """Per-model call, retry and rate-limit counters, adaptive rates and breaker state."""
+    return upstream.snapshot()
@@ -1,3 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
-router = APIRouter(prefix="/homework", tags=["Homework"])
\ No newline at end of file
+from app.dto.content import HomeworkRead, HomeworkRequest
+from app.services.homework_service import generate_homework
+
+router = APIRouter(prefix="/homework", tags=["Homework"])
+
+
+@router.post("/generate", response_model=HomeworkRead)
+async def create_homework(request: HomeworkRequest):
+    """Generate homework for the material inline (see /api/jobs for background runs)."""
+    if not request.material.strip():
+        raise HTTPException(status_code=400, detail="Material cannot be empty")
+
+    return HomeworkRead(homework=await generate_homework(request.material, request.use_materials))
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.dto.jobs import JobCreate, JobRead
+from app.services.job_queue import job_queue
+from app.utils.sse import sse_event, stream_with_heartbeat
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.post("", response_model=JobRead, status_code=202)
+async def submit_job(request: JobCreate):
+    """Queue a mind map, homework or lesson generation and return its job id."""
+    if not request.material.strip():
+        raise HTTPException(status_code=400, detail="Material cannot be empty")
+
+    job_id = await job_queue.submit(
+        request.kind, {"material": request.material, "use_materials": request.use_materials}
+    )
+    return JobRead(**await job_queue.get(job_id))
+
+
+@router.get("/stats")
+async def get_job_stats():
+    """Queue depth per model, cumulative wait and run time."""
+    return job_queue.snapshot()
+
+
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobRead(**job)
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """Stream job status changes as server-sent events until it finishes."""
+    if await job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def frames():
+        async for job in job_queue.watch(job_id):
+            yield sse_event(JobRead(**job).model_dump(), event=job["status"])
+
+    return StreamingResponse(stream_with_heartbeat(request, frames()), media_type="text/event-stream")
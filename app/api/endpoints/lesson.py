@@ -1,3 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
-router = APIRouter(prefix="/lesson", tags=["Lesson"])
\ No newline at end of file
+from app.dto.content import LessonRead, MaterialRequest
+from app.services.lesson_service import generate_lesson
+
+router = APIRouter(prefix="/lesson", tags=["Lesson"])
+
+
+@router.post("/generate", response_model=LessonRead)
+async def create_lesson(request: MaterialRequest):
+    """Generate a lesson for the material inline (see /api/jobs for background runs)."""
+    if not request.material.strip():
+        raise HTTPException(status_code=400, detail="Material cannot be empty")
+
+    return LessonRead(lesson=await generate_lesson(request.material))
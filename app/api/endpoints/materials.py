@@ -1,3 +1,58 @@
-from fastapi import APIRouter
+import json
+from dataclasses import asdict
 
-router = APIRouter(prefix="/materials", tags=["Materials"])
\ No newline at end of file
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.dto.materials import ParsedMaterialRead
+from app.services.materials_service import get_document_parsers, get_parsed_document, ingest_files, store_uploads
+from app.services.retrieval_service import remove_material, retrieve
+
+router = APIRouter(prefix="/materials", tags=["Materials"])
+
+
+@router.post("/bulk")
+async def upload_materials(files: list[UploadFile] = File(...)):
+    """Upload many files or zip archives and stream per-file parse progress as NDJSON."""
+    batch_id, paths, rejected = await store_uploads(files)
+
+    async def progress():
+        yield json.dumps({"event": "accepted", "batch_id": batch_id, "total": len(paths)}) + "\n"
+        for event in rejected:
+            yield json.dumps(event) + "\n"
+        async for event in ingest_files(batch_id, paths):
+            yield json.dumps(event) + "\n"
+        yield json.dumps({"event": "done", "batch_id": batch_id}) + "\n"
+
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
+
+@router.get("/search")
+async def search_materials(q: str, k: int = Query(5, ge=1, le=settings.retrieval.RETRIEVAL_MAX_K)):
+    """Top-k material chunks for a query (backs the `file_search` tool)."""
+    return await retrieve(q, k)
+
+
+@router.get("/{sha256}", response_model=ParsedMaterialRead)
+async def get_material(sha256: str, parser: str | None = None):
+    """Extracted text of a material by content hash, without re-parsing.
+
+    `parser` (the file extension, e.g. "pdf") is only needed when the same
+    content was uploaded under several extensions.
+    """
+    if parser is None:
+        parsers = await get_document_parsers(sha256)
+        if len(parsers) > 1:
+            raise HTTPException(status_code=409, detail=f"Parsed by several parsers, pass one of: {', '.join(parsers)}")
+        parser = parsers[0] if parsers else ""
+    doc = await get_parsed_document(sha256, parser)
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Material not found")
+    return ParsedMaterialRead(**asdict(doc))
+
+
+@router.delete("/{sha256}/index")
+async def unindex_material(sha256: str):
+    """Remove a material's chunks from the search index."""
+    return {"removed_chunks": await remove_material(sha256)}
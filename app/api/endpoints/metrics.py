@@ -0,0 +1,76 @@
+from collections.abc import Callable
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.core.database import pool_stats
+from app.core.logger import logger
+from app.services.chat_service import chat_stats
+from app.services.job_queue import job_queue
+from app.services.mind_map_service import cache_stats, coalescing_stats
+from app.services.session_service import session_store
+from app.services.upstream import upstream
+
+router = APIRouter(tags=["Metrics"])
+
+
+class StatsCollector(Collector):
+    """Exposes the services' in-process stats dicts as gauges at scrape time.
+
+    Sources keyed by an entity (a cache tier, an upstream model) become one
+    gauge per stat with that entity as a label; non-numeric values are skipped.
+    """
+
+    LABELLED: dict[str, tuple[str, Callable[[], dict[str, dict]]]] = {
+        "cache": ("cache", cache_stats),
+        "coalescing": ("stage", coalescing_stats),
+        "upstream": ("model", upstream.snapshot),
+    }
+    FLAT: dict[str, Callable[[], dict]] = {
+        "chat": lambda: chat_stats,
+        "db_pool": pool_stats,
+        "jobs": job_queue.snapshot,
+        "logging": logger.snapshot,
+        "sessions": session_store.snapshot,
+    }
+
+    def collect(self):
+        for source, (label, snapshot) in self.LABELLED.items():
+            families: dict[str, GaugeMetricFamily] = {}
+            for entity, stats in snapshot().items():
+                for name, value in stats.items():
+                    if not _is_number(value):
+                        continue
+                    if name not in families:
+                        families[name] = GaugeMetricFamily(f"app_{source}_{name}", f"{source} {name}", labels=[label])
+                    families[name].add_metric([entity], value)
+            yield from families.values()
+
+        for source, snapshot in self.FLAT.items():
+            for name, value in snapshot().items():
+                if _is_number(value):
+                    yield GaugeMetricFamily(f"app_{source}_{name}", f"{source} {name}", value=value)
+                elif isinstance(value, dict):
+                    # e.g. jobs queue_depth per model
+                    family = GaugeMetricFamily(f"app_{source}_{name}", f"{source} {name}", labels=["key"])
+                    for key, item in value.items():
+                        if _is_number(item):
+                            family.add_metric([key], item)
+                    yield family
+
+
+def _is_number(value) -> bool:
+    # Booleans (e.g. pool "initialized") export as 0/1.
+    return isinstance(value, (int, float))
+
+
+REGISTRY.register(StatsCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus exposition: route and stage latency histograms, token counters and service stats."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
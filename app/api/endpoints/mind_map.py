@@ -1,14 +1,42 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import os
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import get_session
 from app.dto.content import MindMapRead
-from app.services.mind_map_service import generate_mind_map_card
+from app.dto.mind_map import (
+    MindMapAppend,
+    MindMapCreate,
+    MindMapDeltaRead,
+    MindMapDiffRead,
+    MindMapVersionRead,
+)
+from app.models.mind_map import MindMapVersion
+from app.repos.mind_map_repo import MindMapRepo
+from app.services.image_store import resolve_image
+from app.services.mind_map_service import (
+    cache_stats,
+    coalescing_stats,
+    generate_mind_map_card,
+    image_url,
+)
+from app.services.mind_map_version_service import append_to_mind_map, create_mind_map
+from app.utils.mind_map_tree import MindMap, MindMapDiff
 
 router = APIRouter(prefix="/mindmap", tags=["Mind Map"])
 
 
 class MindMapRequest(BaseModel):
     material: str
+    # "local" draws the tree in milliseconds; "artistic" uses gpt-image-1.
+    renderer: Literal["artistic", "local"] = "artistic"
+    image_format: Literal["png", "svg"] = "png"
 
 
 @router.post("/generate", response_model=MindMapRead)
@@ -17,9 +45,118 @@ async def generate_mind_map(request: MindMapRequest):
     if not request.material.strip():
         raise HTTPException(status_code=400, detail="Material cannot be empty")
 
-    result = generate_mind_map_card(request.material)
+    result = await generate_mind_map_card(
+        request.material, renderer=request.renderer, image_format=request.image_format
+    )
 
     return MindMapRead(
         mind_map_text=result["mind_map_text"],
         image_path=result["image_path"],
+        image_url=result["image_url"],
+    )
+
+
+def _version_read(row: MindMapVersion, diff: MindMapDiff | None = None) -> MindMapVersionRead:
+    tree = MindMap.from_dict(row.tree)
+    return MindMapVersionRead(
+        id=row.mind_map_id,
+        version=row.version,
+        mind_map_text=tree.to_markdown(),
+        tree=tree.to_dict()["root"],
+        image_url=image_url(row.image_path),
+        image_version=row.image_version,
+        branch_image_urls={branch: image_url(path) for branch, path in row.branch_images.items()},
+        diff=MindMapDiffRead(version=row.version, **diff.to_dict()) if diff is not None else None,
+    )
+
+
+@router.post("/maps", response_model=MindMapVersionRead, status_code=201)
+async def create_versioned_mind_map(request: MindMapCreate):
+    """Generate a mind map that can later be extended with more material."""
+    if not request.material.strip():
+        raise HTTPException(status_code=400, detail="Material cannot be empty")
+    row = await create_mind_map(request.material, renderer=request.renderer, image_format=request.image_format)
+    return _version_read(row)
+
+
+@router.get("/maps/{mind_map_id}", response_model=MindMapVersionRead)
+async def get_versioned_mind_map(mind_map_id: UUID, db: AsyncSession = Depends(get_session)):
+    """The latest version in full."""
+    repo = MindMapRepo(db)
+    document = await repo.get(mind_map_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Mind map not found")
+    return _version_read(await repo.get_version(mind_map_id, document.version))
+
+
+@router.post("/maps/{mind_map_id}/material", response_model=MindMapVersionRead)
+async def append_mind_map_material(mind_map_id: UUID, request: MindMapAppend):
+    """Extend the map with new material.
+
+    Only the new material and a compact form of the current tree go to the
+    model; the changes are merged as a diff and only the changed branches
+    are re-rendered. `diff` is empty when the material added nothing.
+    """
+    if not request.material.strip():
+        raise HTTPException(status_code=400, detail="Material cannot be empty")
+    result = await append_to_mind_map(mind_map_id, request.material)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Mind map not found")
+    row, diff = result
+    return _version_read(row, diff)
+
+
+@router.get("/maps/{mind_map_id}/delta", response_model=MindMapDeltaRead)
+async def get_mind_map_delta(
+    mind_map_id: UUID, since: int = Query(ge=1), db: AsyncSession = Depends(get_session)
+):
+    """Diffs to apply, in order, to a copy at version `since`, and the current images."""
+    repo = MindMapRepo(db)
+    document = await repo.get(mind_map_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Mind map not found")
+    if since > document.version:
+        raise HTTPException(status_code=409, detail=f"Latest version is {document.version}")
+    latest = await repo.get_version(mind_map_id, document.version)
+    return MindMapDeltaRead(
+        id=mind_map_id,
+        since=since,
+        version=document.version,
+        diffs=[MindMapDiffRead(version=version, **diff) for version, diff in await repo.diffs_after(mind_map_id, since)],
+        image_url=image_url(latest.image_path),
+        image_version=latest.image_version,
+        branch_image_urls={branch: image_url(path) for branch, path in latest.branch_images.items()},
     )
+
+
+@router.get("/images/{name}")
+async def get_mind_map_image(name: str, request: Request, variant: Literal["webp", "thumb"] | None = None):
+    """Serve a stored image. Names are content hashes, so responses are immutable."""
+    resolved = await resolve_image(name, variant)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    path, media_type, etag = resolved
+
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if_none_match = request.headers.get("if-none-match", "")
+    # Weak comparison: compressed responses carry the tag as W/"...".
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    try:
+        # Stat here so an image evicted since resolve_image() is a 404, not a failed response.
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters of the mind map result cache."""
+    return cache_stats()
+
+
+@router.get("/coalescing/stats")
+async def get_coalescing_stats():
+    """How many upstream calls were saved by coalescing identical requests."""
+    return coalescing_stats()
@@ -1,3 +1,70 @@
-from fastapi import APIRouter
+from uuid import UUID
 
-router = APIRouter(prefix="/session", tags=["Seeion"])
\ No newline at end of file
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_session
+from app.dto.session import SessionCreate, SessionMessageCreate, SessionRead, SessionTurnRead
+from app.repos.session_repo import SessionRepo
+from app.services.session_service import session_store, stream_session_reply
+from app.utils.sse import stream_with_heartbeat
+
+router = APIRouter(prefix="/session", tags=["Session"])
+
+
+@router.post("", response_model=SessionRead, status_code=201)
+async def create_session(request: SessionCreate):
+    state = await session_store.create(request.mode)
+    return SessionRead(id=state.id, mode=state.mode, turn_count=0, summary="", summary_through=0)
+
+
+@router.get("/stats")
+async def get_session_stats():
+    """Hot-cache hits, compactions and the size of the last prompt built."""
+    return session_store.snapshot()
+
+
+@router.get("/{session_id}", response_model=SessionRead)
+async def get_session_history(session_id: UUID, db: AsyncSession = Depends(get_session)):
+    """The session's summary and its most recent turns (SESSION_HISTORY_LIMIT)."""
+    repo = SessionRepo(db)
+    session = await repo.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    turns = await repo.recent_turns(session_id, settings.session.SESSION_HISTORY_LIMIT)
+    return SessionRead(
+        id=session.id,
+        mode=session.mode,
+        turn_count=session.turn_count,
+        summary=session.summary,
+        summary_through=session.summary_through,
+        turns=[SessionTurnRead(seq=turn.seq, role=turn.role, content=turn.content) for turn in turns],
+    )
+
+
+@router.post("/{session_id}/messages")
+async def post_session_message(session_id: UUID, body: SessionMessageCreate, request: Request):
+    """Add the learner's message and stream the tutor's reply over server-sent events.
+
+    Only the session id and the new message are sent; the history, bounded
+    by a token window and a rolling summary, is kept server-side.
+    """
+    if not body.content.strip():
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+    state = await session_store.get(session_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    frames = stream_with_heartbeat(
+        request,
+        stream_session_reply(state, body.content, body.use_materials),
+        heartbeat=settings.ai.CHAT_HEARTBEAT_SECONDS,
+        buffer=settings.ai.CHAT_STREAM_BUFFER,
+    )
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
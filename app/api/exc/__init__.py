@@ -0,0 +1,18 @@
+import math
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.upstream import UpstreamUnavailableError
+
+
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    app.add_exception_handler(UpstreamUnavailableError, upstream_unavailable_handler)
@@ -0,0 +1,83 @@
+import re
+import time
+from uuid import uuid4
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.middleware.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.tracing import REQUEST_SECONDS, end_trace, start_trace
+
+_REQUEST_ID = re.compile(r"[\w.:-]{1,64}")
+
+
+def _route_template(scope: Scope) -> str:
+    """The matched route as a template (`/api/jobs/{job_id}`), keeping metric labels bounded."""
+    if scope.get("route") is None:
+        return "unmatched"
+    segments = scope["path"].split("/")
+    for name, value in scope.get("path_params", {}).items():
+        for index in range(len(segments) - 1, -1, -1):
+            if segments[index] == str(value):
+                segments[index] = f"{{{name}}}"
+                break
+    return "/".join(segments)
+
+
+class TracingMiddleware:
+    """Times every request, tags it with a request id and logs its stage breakdown.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so streaming
+    responses pass through untouched and the per-request cost stays at a
+    contextvar, a histogram observation and one log line.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        request_id = incoming if _REQUEST_ID.fullmatch(incoming) else uuid4().hex
+        trace, token = start_trace(request_id)
+        status = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", ()), (b"x-request-id", request_id.encode())]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = _route_template(scope)
+            REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(elapsed)
+            fields = {}
+            if trace.spans:
+                fields["spans_ms"] = {path: round(seconds * 1000, 1) for path, seconds in trace.spans}
+            if trace.usage:
+                fields["usage"] = trace.usage
+            logger.info("{} {} {} {:.1f}ms", scope["method"], route, status, elapsed * 1000, **fields)
+            end_trace(token)
+
+
+def register_middleware(app: FastAPI) -> None:
+    cfg = settings.http
+    if cfg.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=cfg.COMPRESSION_MIN_SIZE,
+            gzip_level=cfg.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=cfg.COMPRESSION_BROTLI_QUALITY,
+        )
+    # Added last so it is outermost and its timings include compression.
+    app.add_middleware(TracingMiddleware)
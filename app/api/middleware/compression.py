@@ -0,0 +1,140 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/problem+json", "application/xml", "image/svg+xml")
+# Events must reach the client as they are produced; never buffer or re-frame them.
+STREAMING_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """The preferred encoding we support from an Accept-Encoding header: "br", "gzip" or None."""
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+    best = max(candidates, key=lambda name: weights.get(name, wildcard))
+    return best if weights.get(best, wildcard) > 0 else None
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith(STREAMING_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress `data` and flush, so each chunk is decodable as soon as it arrives."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression for JSON, text and SVG responses.
+
+    A plain ASGI middleware like TracingMiddleware. Bodies below
+    `minimum_size` and responses that are already encoded go out untouched;
+    SSE and NDJSON streams are never compressed. Other streamed bodies (e.g.
+    SVG files) are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        def mark_encoded(message: Message) -> MutableHeaders:
+            headers = MutableHeaders(scope=message)
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The encoded bytes differ from the identity representation.
+                headers["ETag"] = f"W/{etag}"
+            return headers
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                if _compressible(Headers(raw=message.get("headers", []))):
+                    start = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers = mark_encoded(start)
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = compressor.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+            body = compressor.chunk(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,16 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson: several times faster than `json.dumps` on large trees.
+
+    Installed as the app's default response class for endpoints returning
+    plain dicts and lists. Endpoints with a `response_model` keep FastAPI's
+    own path, which serializes the model to JSON bytes in pydantic-core.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -1,4 +1,34 @@
 from .base import BaseConfig
 
 class AIConfig(BaseConfig):
-    pass
\ No newline at end of file
+    OPENAI_API_KEY: str | None = None
+    OPENAI_BASE_URL: str | None = None
+
+    OPENAI_TIMEOUT: float = 60.0
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_TEXT_TIMEOUT: float = 60.0
+    OPENAI_IMAGE_TIMEOUT: float = 120.0
+    # Retries are handled by the upstream scheduler (app/services/upstream.py).
+    OPENAI_MAX_RETRIES: int = 0
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    # Send `prompt_cache_key` (the prompt id) so calls sharing a prompt hit the same provider cache.
+    # Turn off for OpenAI-compatible servers that reject unknown parameters.
+    OPENAI_PROMPT_CACHE_KEY: bool = True
+
+    MIND_MAP_OUTPUT_DIR: str = "mind_maps"
+    MIND_MAP_STORE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    # Images referenced by stored mind map versions live here, outside LRU eviction.
+    MIND_MAP_PINNED_DIR: str = "mind_maps_pinned"
+    MIND_MAP_THUMBNAIL_SIZE: int = 256
+    # Materials estimated above this many tokens are mapped in chunks and merged locally.
+    MIND_MAP_CHUNK_TOKENS: int = 6000
+    MIND_MAP_MAX_PARALLEL_CHUNKS: int = 4
+    # Updates touching more first-level branches than this redraw the whole map instead of each branch.
+    MIND_MAP_MAX_BRANCH_RENDERS: int = 2
+
+    CHAT_MODEL: str = "gpt-4.1-mini"
+    CHAT_TEMPERATURE: float = 0.4
+    CHAT_MAX_TOKENS: int = 1500
+    CHAT_HEARTBEAT_SECONDS: float = 15.0
+    CHAT_STREAM_BUFFER: int = 64
@@ -1,7 +1,19 @@
-from dotenv import load_dotenv, find_dotenv
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv(find_dotenv(".env"))
+
+@lru_cache
+def load_environment() -> None:
+    """Load `.env` into the process environment, once, before the first config is built."""
+    from dotenv import find_dotenv, load_dotenv
+
+    load_dotenv(find_dotenv(".env"))
+
 
 class BaseConfig(BaseSettings):
-    model_config = SettingsConfigDict(case_sensitive=True, env_file_encoding="utf-8", extra="ignore")
\ No newline at end of file
+    model_config = SettingsConfigDict(case_sensitive=True, env_file_encoding="utf-8", extra="ignore")
+
+    def __init__(self, **values):
+        load_environment()
+        super().__init__(**values)
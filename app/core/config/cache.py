@@ -0,0 +1,9 @@
+from .base import BaseConfig
+
+class CacheConfig(BaseConfig):
+    CACHE_ENABLED: bool = True
+    CACHE_DIR: str = ".cache/mind_maps"
+    CACHE_MEMORY_ITEMS: int = 256
+    CACHE_MEMORY_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_DISK_MAX_BYTES: int = 1024 * 1024 * 1024
+    CACHE_TTL_SECONDS: int = 7 * 24 * 3600
@@ -7,6 +7,16 @@ class DBConfig(BaseConfig):
     DB_PASSWORD: str
     DB_NAME: str
 
+    # Per worker process: total connections = workers * (pool size + overflow).
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement cache; set to 0 behind pgbouncer in transaction mode.
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_ECHO: bool = False
+
     @property
     def url(self) -> str:
-        return f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
\ No newline at end of file
+        return f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
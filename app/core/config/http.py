@@ -0,0 +1,10 @@
+from .base import BaseConfig
+
+class HttpConfig(BaseConfig):
+    # gzip/brotli for compressible responses when the client accepts it; SSE and NDJSON streams are never compressed.
+    COMPRESSION_ENABLED: bool = True
+    # Smaller bodies are sent as-is: the encoding overhead outweighs the savings.
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    # Quality 4 costs less CPU than gzip level 6; higher qualities compress better at a steep CPU cost.
+    COMPRESSION_BROTLI_QUALITY: int = 4
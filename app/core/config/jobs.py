@@ -0,0 +1,9 @@
+from .base import BaseConfig
+
+class JobsConfig(BaseConfig):
+    JOBS_DB_PATH: str = ".cache/jobs.sqlite3"
+    # Concurrent jobs per upstream model, e.g. JOBS_MODEL_CONCURRENCY='{"gpt-image-1": 2}'.
+    JOBS_MODEL_CONCURRENCY: dict[str, int] = {"gpt-4.1-mini": 8, "gpt-image-1": 2}
+    JOBS_POLL_INTERVAL: float = 1.0
+    # A running job whose worker has not heartbeated for this long is re-queued (its process died).
+    JOBS_LEASE_SECONDS: float = 60.0
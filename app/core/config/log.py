@@ -0,0 +1,16 @@
+from typing import Literal
+
+from .base import BaseConfig
+
+class LogConfig(BaseConfig):
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # Write records from a background thread; request handlers only enqueue.
+    LOG_ASYNC: bool = True
+    # Records beyond this backlog are dropped (and counted) rather than blocking callers.
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 256
+    # String fields (and messages) longer than this are truncated, e.g. whole materials.
+    LOG_MAX_FIELD_CHARS: int = 2000
+    # Fraction of DEBUG records kept.
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
@@ -0,0 +1,10 @@
+from .base import BaseConfig
+
+class MaterialsConfig(BaseConfig):
+    MATERIALS_DIR: str = "materials"
+    MATERIALS_PARSED_CACHE_DIR: str = ".cache/parsed"
+    MATERIALS_MAX_WORKERS: int | None = None
+    MATERIALS_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MATERIALS_MAX_FILE_BYTES: int = 200 * 1024 * 1024
+    MATERIALS_MAX_ZIP_MEMBERS: int = 2000
+    MATERIALS_MAX_ZIP_BYTES: int = 2 * 1024 * 1024 * 1024
@@ -0,0 +1,16 @@
+from .base import BaseConfig
+
+class RetrievalConfig(BaseConfig):
+    RETRIEVAL_INDEX_DIR: str = ".cache/index"
+    # "openai" for the embeddings API, "hashing" for the deterministic local embedder.
+    RETRIEVAL_EMBEDDER: str = "openai"
+    RETRIEVAL_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    RETRIEVAL_EMBEDDING_DIM: int = 512
+    RETRIEVAL_CHUNK_CHARS: int = 1200
+    RETRIEVAL_CHUNK_OVERLAP: int = 150
+    RETRIEVAL_TOP_K: int = 5
+    # Largest k the search endpoint accepts.
+    RETRIEVAL_MAX_K: int = 50
+    # Above this many vectors, search switches from brute force to IVF.
+    RETRIEVAL_IVF_THRESHOLD: int = 20000
+    RETRIEVAL_NPROBE: int = 8
@@ -0,0 +1,11 @@
+from .base import BaseConfig
+
+class SessionConfig(BaseConfig):
+    # Recent turns sent verbatim with every prompt.
+    SESSION_WINDOW_TOKENS: int = 3000
+    # Upper bound for the rolling summary of older turns.
+    SESSION_SUMMARY_TOKENS: int = 600
+    SESSION_SUMMARY_MODEL: str = "gpt-4.1-mini"
+    # Active sessions kept in memory (least recently used are evicted).
+    SESSION_CACHE_SIZE: int = 1024
+    SESSION_HISTORY_LIMIT: int = 50
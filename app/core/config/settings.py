@@ -1,12 +1,61 @@
+from functools import cached_property
+
 from .ai import AIConfig
+from .cache import CacheConfig
 from .db import DBConfig
+from .http import HttpConfig
+from .jobs import JobsConfig
+from .log import LogConfig
+from .materials import MaterialsConfig
+from .retrieval import RetrievalConfig
+from .session import SessionConfig
+from .upstream import UpstreamConfig
 
 class Settings:
+    """App settings; each config group is read from the environment on first access."""
+
     HOST: str = "localhost"
     PORT: int = 8000
     DEBUG: bool = "DEBUG"
 
-    ai = AIConfig()
-    db = DBConfig()
+    @cached_property
+    def ai(self) -> AIConfig:
+        return AIConfig()
+
+    @cached_property
+    def cache(self) -> CacheConfig:
+        return CacheConfig()
+
+    @cached_property
+    def db(self) -> DBConfig:
+        return DBConfig()
+
+    @cached_property
+    def http(self) -> HttpConfig:
+        return HttpConfig()
+
+    @cached_property
+    def jobs(self) -> JobsConfig:
+        return JobsConfig()
+
+    @cached_property
+    def log(self) -> LogConfig:
+        return LogConfig()
+
+    @cached_property
+    def materials(self) -> MaterialsConfig:
+        return MaterialsConfig()
+
+    @cached_property
+    def retrieval(self) -> RetrievalConfig:
+        return RetrievalConfig()
+
+    @cached_property
+    def session(self) -> SessionConfig:
+        return SessionConfig()
+
+    @cached_property
+    def upstream(self) -> UpstreamConfig:
+        return UpstreamConfig()
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,18 @@
+from .base import BaseConfig
+
+class UpstreamConfig(BaseConfig):
+    # Per-model requests/min and tokens/min, e.g. UPSTREAM_LIMITS='{"gpt-4.1-mini": {"rpm": 500, "tpm": 200000}}'.
+    UPSTREAM_LIMITS: dict[str, dict[str, int]] = {
+        "gpt-4.1-mini": {"rpm": 500, "tpm": 200000},
+        "gpt-image-1": {"rpm": 20, "tpm": 100000},
+        "text-embedding-3-small": {"rpm": 3000, "tpm": 1000000},
+    }
+    UPSTREAM_DEFAULT_RPM: int = 60
+    UPSTREAM_DEFAULT_TPM: int = 100000
+
+    UPSTREAM_MAX_RETRIES: int = 4
+    UPSTREAM_BACKOFF_BASE: float = 0.5
+    UPSTREAM_BACKOFF_MAX: float = 20.0
+
+    UPSTREAM_BREAKER_FAILURES: int = 5
+    UPSTREAM_BREAKER_RESET_SECONDS: float = 30.0
@@ -0,0 +1,93 @@
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+pool_metrics = {"checkouts": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0, "timeouts": 0}
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection (including connect time)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics["timeouts"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            pool_metrics["checkouts"] += 1
+            pool_metrics["wait_seconds_total"] += waited
+            pool_metrics["wait_seconds_max"] = max(pool_metrics["wait_seconds_max"], waited)
+
+
+_engine: AsyncEngine | None = None
+_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def init_engine() -> AsyncEngine:
+    """Create the app-wide engine (called once at startup)."""
+    global _engine, _sessionmaker
+    if _engine is None:
+        db = settings.db
+        _engine = create_async_engine(
+            db.url,
+            poolclass=InstrumentedPool,
+            pool_size=db.DB_POOL_SIZE,
+            max_overflow=db.DB_MAX_OVERFLOW,
+            pool_timeout=db.DB_POOL_TIMEOUT,
+            pool_recycle=db.DB_POOL_RECYCLE,
+            pool_pre_ping=db.DB_POOL_PRE_PING,
+            connect_args={"prepared_statement_cache_size": db.DB_STATEMENT_CACHE_SIZE},
+            echo=db.DB_ECHO,
+        )
+        _sessionmaker = async_sessionmaker(_engine, expire_on_commit=False)
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """Close pooled connections on shutdown."""
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = _sessionmaker = None
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """A session that rolls back if the block fails, for work outside requests."""
+    if _sessionmaker is None:
+        init_engine()
+    async with _sessionmaker() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Request-scoped session dependency; rolls back if the request fails."""
+    async with session_scope() as session:
+        yield session
+
+
+def pool_stats() -> dict:
+    if _engine is None:
+        return {"initialized": False, **pool_metrics}
+    pool = _engine.pool
+    return {
+        "initialized": True,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        **pool_metrics,
+    }
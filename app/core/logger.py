@@ -1,25 +1,207 @@
+import atexit
+import json
+import os
+import queue
+import random
 import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from functools import partial
+from typing import TextIO
 
 from loguru import logger as loguru_logger
 
+from app.core.config import settings
+from app.core.tracing import current_request_id
+
+Renderer = Callable[[dict], str]
+
+
+def _truncate(value, limit: int):
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]}… [{len(value) - limit} chars truncated]"
+    return value
+
+
+def _exception_text(record: dict) -> str:
+    exception = record["exception"]
+    return "".join(traceback.format_exception(exception.type, exception.value, exception.traceback))
+
+
+def render_text(record: dict, max_chars: int) -> str:
+    extra = record["extra"]
+    line = (
+        f"{record['time']:%Y-%m-%d %H:%M:%S}.{record['time'].microsecond // 1000:03d} | "
+        f"{record['level'].name:<8} | {extra.get('request_id', '-')} | "
+        f"{record['name']}:{record['function']}:{record['line']} - {_truncate(record['message'], max_chars)}"
+    )
+    fields = " ".join(f"{key}={value}" for key, value in extra.items() if key != "request_id")
+    if fields:
+        line = f"{line} | {fields}"
+    if record["exception"]:
+        line = f"{line}\n{_exception_text(record).rstrip()}"
+    return line + "\n"
+
+
+def render_json(record: dict, max_chars: int) -> str:
+    payload = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": _truncate(record["message"], max_chars),
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        **record["extra"],
+    }
+    if record["exception"]:
+        payload["exception"] = _exception_text(record)
+    return json.dumps(payload, ensure_ascii=False, default=str) + "\n"
+
+
+class BackgroundSink:
+    """Loguru sink that hands records to a writer thread through a bounded queue.
+
+    Callers only pay for an enqueue. Rendering and I/O happen on the writer
+    thread, which drains the queue in batches of up to `batch_size` records
+    per write. When the stream can't keep up and the queue is full, new
+    records are dropped and counted instead of blocking the event loop; the
+    writer reports the number dropped in the output.
+    """
+
+    def __init__(self, stream: TextIO, render: Renderer, queue_size: int, batch_size: int):
+        self._stream = stream
+        self._render = render
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._reported_drops = 0
+        self.stats = {"written": 0, "dropped": 0}
+        self._start()
+        # Threads don't survive fork; process-pool workers need their own writer.
+        os.register_at_fork(after_in_child=self._start)
+
+    def _start(self) -> None:
+        self._queue: queue.Queue = queue.Queue(self._queue_size)
+        threading.Thread(target=self._run, name="log-writer", daemon=True).start()
+
+    def __call__(self, message) -> None:
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _run(self) -> None:
+        pending = self._queue
+        while True:
+            batch = [pending.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for _ in batch:
+                pending.task_done()
+
+    def _write(self, records: list[dict]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(self._render(record))
+            except Exception as e:
+                lines.append(f"log record could not be rendered: {e!r}\n")
+        dropped = self.stats["dropped"] - self._reported_drops
+        if dropped:
+            self._reported_drops += dropped
+            lines.append(f"log sink overloaded, dropped {dropped} records\n")
+        try:
+            self._stream.write("".join(lines))
+            self._stream.flush()
+        except Exception:
+            pass
+        self.stats["written"] += len(records)
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Wait (bounded) for queued records to be written, e.g. at shutdown."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "queue_depth": self._queue.qsize()}
+
+
+def _add_request_id(record) -> None:
+    record["extra"]["request_id"] = current_request_id() or "-"
+
 
 class AppLogger:
+    """Thin loguru wrapper with lazy formatting and structured fields.
+
+    Positional arguments fill `{}` placeholders only when the level is
+    enabled: `logger.warning("Failed to parse {}: {}", path, e)`. Keyword
+    arguments become structured fields (JSON keys, or `key=value` in text
+    output). Long string arguments and fields are truncated to
+    LOG_MAX_FIELD_CHARS before formatting.
+    """
+
     def __init__(self):
-        loguru_logger.remove(0)
-        loguru_logger.add(sys.stderr)
-        self._logger = loguru_logger
+        cfg = settings.log
+        self._min_level = loguru_logger.level(cfg.LOG_LEVEL.upper()).no
+        self._max_chars = cfg.LOG_MAX_FIELD_CHARS
+        self._debug_sample_rate = cfg.LOG_DEBUG_SAMPLE_RATE
+        self._sampled_out = 0
+
+        render = partial(render_json if cfg.LOG_FORMAT == "json" else render_text, max_chars=cfg.LOG_MAX_FIELD_CHARS)
+        if cfg.LOG_ASYNC:
+            self._sink = BackgroundSink(sys.stderr, render, cfg.LOG_QUEUE_SIZE, cfg.LOG_BATCH_SIZE)
+            sink = self._sink
+        else:
+            self._sink = None
+            sink = lambda message: sys.stderr.write(render(message.record))
+
+        loguru_logger.remove()
+        loguru_logger.configure(patcher=_add_request_id)
+        loguru_logger.add(sink, level=cfg.LOG_LEVEL.upper(), format="{message}", colorize=False)
+        # depth=2 attributes records to the caller of debug()/info()/... rather than this wrapper.
+        self._logger = loguru_logger.opt(depth=2)
+
+    def _log(self, level: str, level_no: int, msg: str, args: tuple, fields: dict) -> None:
+        if level_no < self._min_level:
+            return
+        limit = self._max_chars
+        if args:
+            args = tuple(_truncate(arg, limit) for arg in args)
+        log = self._logger
+        if fields:
+            log = log.bind(**{key: _truncate(value, limit) for key, value in fields.items()})
+        log.log(level, msg, *args)
+
+    def debug(self, msg, *args, **fields):
+        # High-volume debug events are sampled.
+        if self._debug_sample_rate < 1 and random.random() >= self._debug_sample_rate:
+            self._sampled_out += 1
+            return
+        self._log("DEBUG", 10, msg, args, fields)
+
+    def info(self, msg, *args, **fields):
+        self._log("INFO", 20, msg, args, fields)
 
-    def debug(self, msg):
-        self._logger.debug(msg)
+    def warning(self, msg, *args, **fields):
+        self._log("WARNING", 30, msg, args, fields)
 
-    def info(self, msg):
-        self._logger.info(msg)
+    def error(self, msg, *args, **fields):
+        self._log("ERROR", 40, msg, args, fields)
 
-    def warning(self, msg):
-        self._logger.warning(msg)
+    def flush(self, timeout: float = 2.0) -> None:
+        if self._sink is not None:
+            self._sink.flush(timeout)
 
-    def error(self, msg):
-        self._logger.error(msg)
+    def snapshot(self) -> dict:
+        stats = self._sink.snapshot() if self._sink is not None else {}
+        return {**stats, "sampled_out": self._sampled_out}
 
 
-logger = AppLogger()
\ No newline at end of file
+logger = AppLogger()
+atexit.register(logger.flush)
@@ -0,0 +1,88 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from prometheus_client import Counter, Histogram
+
+# Latency buckets from sub-millisecond stages up to long image generations.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"), buckets=BUCKETS
+)
+STAGE_SECONDS = Histogram("app_stage_duration_seconds", "Service stage latency", ("stage",), buckets=BUCKETS)
+OPENAI_TOKENS = Counter("openai_tokens_total", "Tokens reported by OpenAI responses", ("model", "kind"))
+
+
+@dataclass
+class RequestTrace:
+    """Spans and model usage collected while serving one request."""
+
+    request_id: str
+    spans: list[tuple[str, float]] = field(default_factory=list)
+    usage: dict[str, int] = field(default_factory=dict)
+
+
+_trace: ContextVar[RequestTrace | None] = ContextVar("trace", default=None)
+_span_path: ContextVar[str] = ContextVar("span_path", default="")
+
+
+def start_trace(request_id: str) -> tuple[RequestTrace, object]:
+    trace = RequestTrace(request_id)
+    return trace, _trace.set(trace)
+
+
+def end_trace(token) -> None:
+    _trace.reset(token)
+
+
+def current_request_id() -> str | None:
+    trace = _trace.get()
+    return trace.request_id if trace is not None else None
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a stage into the stage histogram and the current request's trace.
+
+    Works in sync and async code. Nested spans are recorded in the trace by
+    their path (`mind_map.card/mind_map.text`); the histogram is labelled by
+    the stage name alone to keep label cardinality bounded.
+    """
+    parent = _span_path.get()
+    path = f"{parent}/{stage}" if parent else stage
+    token = _span_path.set(path)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _span_path.reset(token)
+        STAGE_SECONDS.labels(stage).observe(elapsed)
+        trace = _trace.get()
+        if trace is not None:
+            trace.spans.append((path, elapsed))
+
+
+def record_usage(model: str, usage) -> None:
+    """Count an OpenAI response's token usage globally and on the current request.
+
+    Prompt tokens served from the provider's prefix cache are counted as
+    kind "cached_prompt" (a subset of "prompt").
+    """
+    if usage is None:
+        return
+    trace = _trace.get()
+    counts = {kind: getattr(usage, kind, None) for kind in ("prompt_tokens", "completion_tokens", "total_tokens")}
+    counts["cached_tokens"] = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+    for kind, value in counts.items():
+        if not value:
+            continue
+        if kind == "cached_tokens":
+            OPENAI_TOKENS.labels(model, "cached_prompt").inc(value)
+        elif kind != "total_tokens":
+            OPENAI_TOKENS.labels(model, kind.removesuffix("_tokens")).inc(value)
+        if trace is not None:
+            trace.usage[kind] = trace.usage.get(kind, 0) + value
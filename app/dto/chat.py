@@ -0,0 +1,17 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+ChatMode = Literal["assistant", "socratic"]
+
+
+class ChatMessage(BaseModel):
+    role: Literal["user", "assistant"]
+    content: str
+
+
+class ChatRequest(BaseModel):
+    messages: list[ChatMessage]
+    mode: ChatMode = "assistant"
+    use_materials: bool = False
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+
+class MindMapRead(BaseModel):
+    mind_map_text: str
+    image_path: str
+    image_url: str
+
+
+class MaterialRequest(BaseModel):
+    material: str
+
+
+class HomeworkRequest(MaterialRequest):
+    # Add indexed material related to this material (see /api/materials/bulk).
+    use_materials: bool = False
+
+
+class HomeworkRead(BaseModel):
+    homework: str
+
+
+class LessonRead(BaseModel):
+    lesson: str
@@ -0,0 +1,21 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+
+class JobCreate(BaseModel):
+    kind: Literal["mind_map", "homework", "lesson"]
+    material: str
+    # Homework only: add related indexed material.
+    use_materials: bool = False
+
+
+class JobRead(BaseModel):
+    id: str
+    kind: str
+    status: str
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class ParsedMaterialRead(BaseModel):
+    sha256: str
+    parser: str
+    parser_version: int
+    segment: str
+    text: str
+    offsets: list[tuple[int, int]]
@@ -0,0 +1,64 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class MindMapCreate(BaseModel):
+    material: str
+    renderer: Literal["artistic", "local"] = "artistic"
+    image_format: Literal["png", "svg"] = "png"
+
+
+class MindMapAppend(BaseModel):
+    material: str
+
+
+class MindMapNodeRead(BaseModel):
+    id: str
+    label: str
+    children: list["MindMapNodeRead"] = []
+
+
+class MindMapNodeAdded(BaseModel):
+    id: str
+    parent: str
+    label: str
+
+
+class MindMapNodeRenamed(BaseModel):
+    id: str
+    label: str
+    previous: str
+
+
+class MindMapDiffRead(BaseModel):
+    version: int
+    added: list[MindMapNodeAdded] = []
+    renamed: list[MindMapNodeRenamed] = []
+
+
+class MindMapVersionRead(BaseModel):
+    id: UUID
+    version: int
+    mind_map_text: str
+    tree: MindMapNodeRead
+    image_url: str
+    # Version at which the whole-map image was last rendered.
+    image_version: int
+    # First-level branch id -> image of that branch, for branches changed since `image_version`.
+    branch_image_urls: dict[str, str] = {}
+    # Changes from the previous version, when this version was just created.
+    diff: MindMapDiffRead | None = None
+
+
+class MindMapDeltaRead(BaseModel):
+    """Everything needed to bring a client's copy at `since` up to `version`."""
+
+    id: UUID
+    since: int
+    version: int
+    diffs: list[MindMapDiffRead]
+    image_url: str
+    image_version: int
+    branch_image_urls: dict[str, str] = {}
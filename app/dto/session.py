@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.dto.chat import ChatMode
+
+
+class SessionCreate(BaseModel):
+    mode: ChatMode = "assistant"
+
+
+class SessionTurnRead(BaseModel):
+    seq: int
+    role: str
+    content: str
+
+
+class SessionRead(BaseModel):
+    id: UUID
+    mode: str
+    turn_count: int
+    summary: str
+    summary_through: int
+    turns: list[SessionTurnRead] = []
+
+
+class SessionMessageCreate(BaseModel):
+    content: str
+    use_materials: bool = False
@@ -1,15 +1,47 @@
-import uvicorn
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.api.endpoints import router
+from fastapi.datastructures import Default
+from app.api.endpoints import metrics_router, router
+from app.api.exc import register_exception_handlers
+from app.api.middleware import register_middleware
+from app.api.responses import FastJSONResponse
 from app.core.config import settings
+from app.core.database import dispose_engine, init_engine
+from app.core.logger import logger
+from app.services.job_queue import job_queue
+from app.services.materials_service import shutdown_ingest_pool
+from app.services.openai_client import close_openai_client
+from app.services.session_service import session_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_engine()
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    await session_store.stop()
+    await dispose_engine()
+    await close_openai_client()
+    shutdown_ingest_pool()
+    logger.flush()
 
-app = FastAPI()
+
+# Wrapped in Default() so routes with a response_model keep FastAPI's pydantic-core fast path.
+app = FastAPI(lifespan=lifespan, default_response_class=Default(FastJSONResponse))
 app.include_router(router)
+# Served at the root, where Prometheus scrapes by default.
+app.include_router(metrics_router)
+register_exception_handlers(app)
+register_middleware(app)
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         'app.main:app',
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,5 @@
+from .base import Base, BaseId
+from .mind_map import MindMapDocument, MindMapVersion
+from .session import SessionTurn, TutorSession
+
+__all__ = ["Base", "BaseId", "MindMapDocument", "MindMapVersion", "SessionTurn", "TutorSession"]
@@ -1,23 +1,87 @@
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, ClassVar
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import Boolean, String, DateTime
+from sqlalchemy import Boolean, Column, Index, String, DateTime, insert
+
+from app.utils.ids import uuid7
+
+BULK_BATCH_SIZE = 1000
+
+
+def jsonb_gin_index(name: str, column: Column | str, path_ops: bool = True) -> Index:
+    """GIN index for a JSONB column, for `@>` containment (and, without `path_ops`, key existence) queries.
+
+    `jsonb_path_ops` indexes are smaller and faster but only support `@>`.
+    Use in `__table_args__`: `(jsonb_gin_index("ix_turns_meta", "meta"),)`.
+    """
+    column_name = column if isinstance(column, str) else column.name
+    ops = {"postgresql_ops": {column_name: "jsonb_path_ops"}} if path_ops else {}
+    return Index(name, column, postgresql_using="gin", **ops).ddl_if(dialect="postgresql")
+
 
 class Base(DeclarativeBase):
+    # JSONB (not JSON / ARRAY(JSON)) so documents can be GIN-indexed and queried in place.
     type_annotation_map: ClassVar = {
         UUID: postgresql.UUID,
-        dict[str, Any]: postgresql.JSON,
-        list[dict[str, Any]]: postgresql.ARRAY(postgresql.JSON),
+        dict[str, Any]: postgresql.JSONB,
+        list[dict[str, Any]]: postgresql.JSONB,
         list[str]: postgresql.ARRAY(String),
         Decimal: postgresql.NUMERIC(10, 2),
         datetime: DateTime(timezone=True),
         bool: Boolean,
     }
 
+    @classmethod
+    async def bulk_insert(cls, db: AsyncSession, rows: list[dict[str, Any]], batch_size: int = BULK_BATCH_SIZE) -> int:
+        """Insert plain dicts in multi-row batches, bypassing the unit of work.
+
+        Column defaults (e.g. `id`) are applied. The caller commits.
+        """
+        for start in range(0, len(rows), batch_size):
+            await db.execute(insert(cls), rows[start:start + batch_size])
+        return len(rows)
+
+    @classmethod
+    async def bulk_upsert(
+        cls,
+        db: AsyncSession,
+        rows: list[dict[str, Any]],
+        index_elements: list[str],
+        update_columns: list[str] | None = None,
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> int:
+        """INSERT ... ON CONFLICT (index_elements) DO UPDATE in batches (PostgreSQL).
+
+        Conflicting rows get `update_columns` from the new row; by default every
+        supplied column except the conflict target and the primary key. With
+        no columns to update the conflict is ignored. The caller commits.
+        """
+        if not rows:
+            return 0
+        primary_keys = {column.name for column in cls.__table__.primary_key}
+        if update_columns is None:
+            update_columns = [name for name in rows[0] if name not in index_elements and name not in primary_keys]
+
+        statement = postgresql.insert(cls)
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={name: statement.excluded[name] for name in update_columns},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+        for start in range(0, len(rows), batch_size):
+            await db.execute(statement, rows[start:start + batch_size])
+        return len(rows)
+
+
 class BaseId(Base):
     __abstract__ = True
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4, index=True)
\ No newline at end of file
+    # Time-ordered keys keep inserts at the right edge of the primary key index,
+    # which already covers lookups by id.
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseId
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class MindMapDocument(BaseId):
+    """A mind map that grows as material is appended; `version` is its latest MindMapVersion."""
+
+    __tablename__ = "mind_maps"
+
+    renderer: Mapped[str]
+    image_format: Mapped[str]
+    version: Mapped[int] = mapped_column(default=1)
+    created_at: Mapped[datetime] = mapped_column(default=_now)
+    updated_at: Mapped[datetime] = mapped_column(default=_now, onupdate=_now)
+
+
+class MindMapVersion(BaseId):
+    __tablename__ = "mind_map_versions"
+    # Also rejects two updates racing to write the same version.
+    __table_args__ = (UniqueConstraint("mind_map_id", "version"),)
+
+    mind_map_id: Mapped[UUID] = mapped_column(ForeignKey("mind_maps.id", ondelete="CASCADE"))
+    version: Mapped[int]
+    # MindMap.to_dict() and MindMapDiff.to_dict() (empty for version 1).
+    tree: Mapped[dict[str, Any]]
+    diff: Mapped[dict[str, Any]] = mapped_column(default=dict)
+    # Whole-map image, last rendered at `image_version`.
+    image_path: Mapped[str]
+    image_version: Mapped[int]
+    # First-level branch id -> image of that subtree, for branches changed since `image_version`
+    # (empty whenever the whole map is redrawn).
+    branch_images: Mapped[dict[str, Any]] = mapped_column(default=dict)
+    created_at: Mapped[datetime] = mapped_column(default=_now)
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseId
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TutorSession(BaseId):
+    """A tutoring conversation; turns up to `summary_through` are folded into `summary`."""
+
+    __tablename__ = "tutor_sessions"
+
+    mode: Mapped[str]
+    summary: Mapped[str] = mapped_column(Text, default="")
+    summary_through: Mapped[int] = mapped_column(default=0)
+    turn_count: Mapped[int] = mapped_column(default=0)
+    created_at: Mapped[datetime] = mapped_column(default=_now)
+    updated_at: Mapped[datetime] = mapped_column(default=_now, onupdate=_now)
+
+
+class SessionTurn(BaseId):
+    __tablename__ = "session_turns"
+    # Also serves lookups of a session's turns after a given seq.
+    __table_args__ = (UniqueConstraint("session_id", "seq"),)
+
+    session_id: Mapped[UUID] = mapped_column(ForeignKey("tutor_sessions.id", ondelete="CASCADE"))
+    seq: Mapped[int]
+    role: Mapped[str]
+    content: Mapped[str] = mapped_column(Text)
+    # Estimated once on write so prompt windows are sized without re-tokenizing.
+    tokens: Mapped[int]
+    created_at: Mapped[datetime] = mapped_column(default=_now)
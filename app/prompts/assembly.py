@@ -0,0 +1,74 @@
+"""Versioned prompts and the one place chat messages are assembled.
+
+Providers cache the longest previously seen prompt prefix (OpenAI: from
+1024 tokens, in 128-token steps), so every message list is laid out from
+the most to the least stable part:
+
+1. the static system prompt,
+2. stable context that only changes between calls of a conversation or
+   document (a session summary, the current mind map),
+3. the conversation history, oldest first,
+4. per-turn content (retrieved material, the new question or material).
+
+Nothing variable may precede something stable, and the static parts are
+module constants, so consecutive calls share byte-identical prefixes.
+"""
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cached_property
+
+from app.core.config import settings
+from app.prompts.HOMEWORK_GENERATION_PROMPT import HOMEWORK_GENERATION_PROMPT
+from app.prompts.SOCRATIC_MODE_PROMPT import SOCRATIC_MODE_PROMPT
+from app.prompts.mind_map_prompt import PROMPT_MIND_MAP_SYSTEM, PROMPT_MIND_MAP_UPDATE
+from app.prompts.session_summary_prompt import PROMPT_SESSION_SUMMARY
+from app.prompts.system_prompt import SYS_PROMPT_LEARNING_ASSISTANT
+
+
+@dataclass(frozen=True)
+class Prompt:
+    name: str
+    text: str
+
+    @cached_property
+    def id(self) -> str:
+        """`name@<content hash>`: changes whenever the text does, for cache keys and prompt-cache routing."""
+        return f"{self.name}@{hashlib.sha256(self.text.encode()).hexdigest()[:12]}"
+
+
+LEARNING_ASSISTANT = Prompt("learning_assistant", SYS_PROMPT_LEARNING_ASSISTANT)
+SOCRATIC = Prompt("socratic", SOCRATIC_MODE_PROMPT)
+HOMEWORK = Prompt("homework", HOMEWORK_GENERATION_PROMPT)
+MIND_MAP = Prompt("mind_map", PROMPT_MIND_MAP_SYSTEM)
+MIND_MAP_UPDATE = Prompt("mind_map_update", PROMPT_MIND_MAP_UPDATE)
+SESSION_SUMMARY = Prompt("session_summary", PROMPT_SESSION_SUMMARY)
+
+PROMPTS = {
+    prompt.name: prompt
+    for prompt in (LEARNING_ASSISTANT, SOCRATIC, HOMEWORK, MIND_MAP, MIND_MAP_UPDATE, SESSION_SUMMARY)
+}
+MODE_PROMPTS = {"assistant": LEARNING_ASSISTANT, "socratic": SOCRATIC}
+
+
+def assemble_messages(
+    prompt: Prompt,
+    stable: Iterable[str] = (),
+    history: Iterable[dict] = (),
+    turn: Iterable[dict] = (),
+) -> list[dict]:
+    """Static prompt, then stable context blocks (as system messages), then history, then per-turn messages."""
+    messages = [{"role": "system", "content": prompt.text}]
+    messages.extend({"role": "system", "content": block} for block in stable if block)
+    messages.extend(history)
+    messages.extend(turn)
+    return messages
+
+
+def user_message(content: str) -> dict:
+    return {"role": "user", "content": content}
+
+
+def request_options(prompt: Prompt) -> dict:
+    """Extra completion arguments: route calls sharing a prompt to the same provider cache."""
+    return {"prompt_cache_key": prompt.id} if settings.ai.OPENAI_PROMPT_CACHE_KEY else {}
@@ -0,0 +1,74 @@
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.mind_map import MindMapDocument, MindMapVersion
+
+
+class MindMapRepo:
+    """Persistence for versioned mind maps."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, renderer: str, image_format: str, tree: dict, image_path: str) -> MindMapVersion:
+        """Create the map with its first version in one transaction."""
+        document = MindMapDocument(renderer=renderer, image_format=image_format)
+        self.db.add(document)
+        await self.db.flush()
+        version = MindMapVersion(
+            mind_map_id=document.id, version=1, tree=tree, image_path=image_path, image_version=1
+        )
+        self.db.add(version)
+        await self.db.commit()
+        return version
+
+    async def get(self, mind_map_id: UUID) -> MindMapDocument | None:
+        return await self.db.get(MindMapDocument, mind_map_id)
+
+    async def get_version(self, mind_map_id: UUID, version: int) -> MindMapVersion | None:
+        result = await self.db.execute(
+            select(MindMapVersion).where(MindMapVersion.mind_map_id == mind_map_id, MindMapVersion.version == version)
+        )
+        return result.scalar_one_or_none()
+
+    async def diffs_after(self, mind_map_id: UUID, version: int) -> list[tuple[int, dict]]:
+        """(version, diff) of every version after `version`, oldest first; trees are not loaded."""
+        result = await self.db.execute(
+            select(MindMapVersion.version, MindMapVersion.diff)
+            .where(MindMapVersion.mind_map_id == mind_map_id, MindMapVersion.version > version)
+            .order_by(MindMapVersion.version)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def add_version(
+        self,
+        mind_map_id: UUID,
+        version: int,
+        tree: dict,
+        diff: dict,
+        image_path: str,
+        image_version: int,
+        branch_images: dict,
+    ) -> MindMapVersion:
+        """Insert the next version and point the map at it in one transaction.
+
+        The (mind_map_id, version) unique constraint rejects a version written
+        concurrently with the same number.
+        """
+        row = MindMapVersion(
+            mind_map_id=mind_map_id,
+            version=version,
+            tree=tree,
+            diff=diff,
+            image_path=image_path,
+            image_version=image_version,
+            branch_images=branch_images,
+        )
+        self.db.add(row)
+        await self.db.execute(
+            update(MindMapDocument).where(MindMapDocument.id == mind_map_id).values(version=version)
+        )
+        await self.db.commit()
+        return row
@@ -0,0 +1,62 @@
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.session import SessionTurn, TutorSession
+
+
+class SessionRepo:
+    """Persistence for tutoring sessions and their turns."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, mode: str) -> TutorSession:
+        session = TutorSession(mode=mode)
+        self.db.add(session)
+        await self.db.commit()
+        return session
+
+    async def get(self, session_id: UUID) -> TutorSession | None:
+        return await self.db.get(TutorSession, session_id)
+
+    async def turns_after(self, session_id: UUID, seq: int) -> list[SessionTurn]:
+        result = await self.db.execute(
+            select(SessionTurn)
+            .where(SessionTurn.session_id == session_id, SessionTurn.seq > seq)
+            .order_by(SessionTurn.seq)
+        )
+        return list(result.scalars())
+
+    async def recent_turns(self, session_id: UUID, limit: int) -> list[SessionTurn]:
+        result = await self.db.execute(
+            select(SessionTurn)
+            .where(SessionTurn.session_id == session_id)
+            .order_by(SessionTurn.seq.desc())
+            .limit(limit)
+        )
+        return list(reversed(result.scalars().all()))
+
+    async def add_turn(self, session_id: UUID, seq: int, role: str, content: str, tokens: int) -> SessionTurn:
+        """Insert a turn and bump the session's turn count in one transaction.
+
+        The (session_id, seq) unique constraint rejects a turn written
+        concurrently with the same seq.
+        """
+        turn = SessionTurn(session_id=session_id, seq=seq, role=role, content=content, tokens=tokens)
+        self.db.add(turn)
+        await self.db.execute(
+            update(TutorSession).where(TutorSession.id == session_id).values(turn_count=seq)
+        )
+        await self.db.commit()
+        return turn
+
+    async def save_summary(self, session_id: UUID, summary: str, summary_through: int) -> None:
+        # Never move the summary backwards if two compactions race.
+        await self.db.execute(
+            update(TutorSession)
+            .where(TutorSession.id == session_id, TutorSession.summary_through < summary_through)
+            .values(summary=summary, summary_through=summary_through)
+        )
+        await self.db.commit()
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.tracing import record_usage, span
+from app.dto.chat import ChatRequest
+from app.prompts.assembly import MODE_PROMPTS, assemble_messages, request_options
+from app.services.openai_client import get_openai_client
+from app.services.upstream import estimate_request_tokens, upstream
+from app.services.retrieval_service import build_context
+from app.utils.sse import sse_event
+
+chat_stats = {"requests": 0, "completed": 0, "cancelled": 0, "failed": 0, "ttft_seconds_total": 0.0, "tokens_total": 0}
+
+
+async def material_context_message(question: str) -> dict | None:
+    """System message with retrieved material relevant to `question`, if any."""
+    context = await build_context(question) if question else ""
+    return {"role": "system", "content": f"RELEVANT MATERIAL:\n\n{context}"} if context else None
+
+
+async def _build_messages(request: ChatRequest) -> list[dict]:
+    prompt = MODE_PROMPTS[request.mode]
+    history = [m.model_dump() for m in request.messages]
+    context = None
+    if request.use_materials:
+        question = next((m.content for m in reversed(request.messages) if m.role == "user"), "")
+        context = await material_context_message(question)
+    if context is None:
+        return assemble_messages(prompt, history=history)
+    # Retrieved material depends on the question, so it goes right before it
+    # rather than ahead of the history, which would break the cached prefix.
+    split = max(i for i, message in enumerate(history) if message["role"] == "user")
+    return assemble_messages(prompt, history=history[:split], turn=[context, *history[split:]])
+
+
+async def stream_chat(request: ChatRequest) -> AsyncIterator[str]:
+    """Stream a reply to a stateless chat request (the client sends the whole history)."""
+    with span("chat.build_messages"):
+        messages = await _build_messages(request)
+    # Closing explicitly releases the upstream stream as soon as this generator is closed, not at GC.
+    async with aclosing(stream_completion(messages, request.mode)) as frames:
+        async for frame in frames:
+            yield frame
+
+
+async def stream_completion(
+    messages: list[dict],
+    mode: str,
+    on_reply: Callable[[str], Awaitable[None]] | None = None,
+) -> AsyncIterator[str]:
+    """Stream a chat completion as SSE frames, recording TTFT and tokens/sec.
+
+    `on_reply` receives the full reply text once the stream completes, before
+    the final `done` frame; it is not called if the stream fails or the
+    client goes away.
+    """
+    ai = settings.ai
+    chat_stats["requests"] += 1
+    start = time.perf_counter()
+    first_token_at = None
+    parts = []
+    usage = None
+    # Only opening the stream is scheduled and retried; a stream that fails midway is not replayed.
+    try:
+        stream = await upstream.call(
+            ai.CHAT_MODEL,
+            lambda: get_openai_client().chat.completions.create(
+                model=ai.CHAT_MODEL,
+                messages=messages,
+                temperature=ai.CHAT_TEMPERATURE,
+                max_tokens=ai.CHAT_MAX_TOKENS,
+                stream=True,
+                stream_options={"include_usage": True},
+                **request_options(MODE_PROMPTS[mode]),
+            ),
+            estimated_tokens=estimate_request_tokens(messages, max_tokens=ai.CHAT_MAX_TOKENS),
+        )
+    except Exception:
+        chat_stats["failed"] += 1
+        raise
+    try:
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            delta = chunk.choices[0].delta.content
+            parts.append(delta)
+            yield sse_event({"delta": delta}, event="token")
+    except (asyncio.CancelledError, GeneratorExit):
+        chat_stats["cancelled"] += 1
+        raise
+    except Exception:
+        chat_stats["failed"] += 1
+        raise
+    finally:
+        # Closing the upstream stream stops generation nobody will read.
+        await stream.close()
+
+    end = time.perf_counter()
+    # The stream object carries no usage, so the scheduler can't record it.
+    record_usage(ai.CHAT_MODEL, usage)
+    tokens = usage.completion_tokens if usage else len(parts)
+    ttft = (first_token_at or end) - start
+    generation_time = end - (first_token_at or end)
+    metrics = {
+        "ttft_seconds": round(ttft, 4),
+        "tokens": tokens,
+        "tokens_per_second": round(tokens / generation_time, 2) if generation_time else None,
+        "usage": usage.model_dump() if usage else None,
+    }
+    chat_stats["completed"] += 1
+    chat_stats["ttft_seconds_total"] += ttft
+    chat_stats["tokens_total"] += tokens
+    logger.info(
+        "chat completed",
+        mode=mode,
+        ttft_seconds=metrics["ttft_seconds"],
+        tokens=tokens,
+        tokens_per_second=metrics["tokens_per_second"],
+    )
+    if on_reply is not None:
+        await on_reply("".join(parts))
+    yield sse_event(metrics, event="done")
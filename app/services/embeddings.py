@@ -0,0 +1,67 @@
+import hashlib
+import re
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+from app.services.openai_client import get_openai_client
+from app.services.upstream import estimate_request_tokens, upstream
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy is imported by the embedders on first call, keeping it out of app startup.
+Embedder = Callable[[list[str]], Awaitable["np.ndarray"]]
+
+_TOKEN = re.compile(r"\w+")
+OPENAI_BATCH_SIZE = 256
+
+
+def _normalize(vectors: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def hashing_embedder(dim: int) -> Embedder:
+    """Deterministic local embedder (signed feature hashing of words and bigrams)."""
+
+    async def embed(texts: list[str]) -> "np.ndarray":
+        import numpy as np
+
+        vectors = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                vectors[row, h % dim] += 1.0 if h >> 63 else -1.0
+        return _normalize(vectors)
+
+    return embed
+
+
+def openai_embedder(model: str, dim: int) -> Embedder:
+
+    async def embed(texts: list[str]) -> "np.ndarray":
+        import numpy as np
+
+        vectors = []
+        for i in range(0, len(texts), OPENAI_BATCH_SIZE):
+            batch = texts[i:i + OPENAI_BATCH_SIZE]
+            response = await upstream.call(
+                model,
+                lambda: get_openai_client().embeddings.create(model=model, input=batch, dimensions=dim),
+                estimated_tokens=estimate_request_tokens(prompt="".join(batch)),
+            )
+            vectors.extend(item.embedding for item in response.data)
+        return _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(texts), dim))
+
+    return embed
+
+
+def get_embedder() -> Embedder:
+    cfg = settings.retrieval
+    if cfg.RETRIEVAL_EMBEDDER == "hashing":
+        return hashing_embedder(cfg.RETRIEVAL_EMBEDDING_DIM)
+    return openai_embedder(cfg.RETRIEVAL_EMBEDDING_MODEL, cfg.RETRIEVAL_EMBEDDING_DIM)
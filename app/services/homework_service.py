@@ -0,0 +1,36 @@
+from app.core.config import settings
+from app.prompts.assembly import HOMEWORK, assemble_messages, request_options, user_message
+from app.services.chat_service import material_context_message
+from app.services.openai_client import get_openai_client
+from app.services.upstream import estimate_request_tokens, upstream
+
+HOMEWORK_MODEL = "gpt-4.1-mini"
+
+
+async def generate_homework(material: str, use_materials: bool = False) -> str:
+    """Generate homework tasks for the provided learning material.
+
+    With `use_materials`, indexed chunks related to the start of the material
+    are added so tasks can draw on the rest of the course.
+    """
+    turn = [user_message(f"LEARNING MATERIAL:\n\n{material}")]
+    if use_materials:
+        context = await material_context_message(material[:settings.retrieval.RETRIEVAL_CHUNK_CHARS])
+        if context is not None:
+            turn.insert(0, context)
+    messages = assemble_messages(HOMEWORK, turn=turn)
+
+    response = await upstream.call(
+        HOMEWORK_MODEL,
+        lambda: get_openai_client().chat.completions.create(
+            model=HOMEWORK_MODEL,
+            messages=messages,
+            temperature=0.4,
+            max_tokens=2000,
+            timeout=settings.ai.OPENAI_TEXT_TIMEOUT,
+            **request_options(HOMEWORK),
+        ),
+        estimated_tokens=estimate_request_tokens(messages, max_tokens=2000),
+    )
+
+    return (response.choices[0].message.content or "").strip()
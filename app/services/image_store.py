@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+import io
+import os
+import re
+from functools import lru_cache
+
+from app.core.config import settings
+from app.utils.cache import DiskCache
+
+CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml", "webp": "image/webp"}
+VARIANTS = ("webp", "thumb")
+_NAME = re.compile(r"(?P<digest>[0-9a-f]{64})\.(?P<extension>png|svg)")
+
+
+class ImageStore:
+    """Content-addressed image store: `<sha256>.<ext>` names, deduplicated writes.
+
+    Total size is bounded by least-recently-used eviction. Pinned images
+    (those stored mind map versions point to) are kept in a separate
+    directory that is never evicted. Raster images get WebP and thumbnail
+    variants on demand, stored in the evicting part.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, pinned_directory: str):
+        self._files = DiskCache(directory, max_bytes, ttl=float("inf"))
+        self._pinned_directory = pinned_directory
+
+    def _pinned_path(self, name: str) -> str:
+        return os.path.join(self._pinned_directory, name[:2], name)
+
+    def put(self, data: bytes, extension: str, pinned: bool = False) -> str:
+        name = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        if pinned:
+            path = self._pinned_path(name)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            return path
+        if self._files.lookup(name) is None:
+            self._files.set(name, data)
+        return self._files.path(name)
+
+    def _original(self, name: str) -> str | None:
+        path = self._pinned_path(name)
+        return path if os.path.exists(path) else self._files.lookup(name)
+
+    def resolve(self, name: str, variant: str | None = None) -> tuple[str, str, str] | None:
+        """Path, content type and strong ETag for a stored image or one of its variants."""
+        match = _NAME.fullmatch(name)
+        if match is None:
+            return None
+        original = self._original(name)
+        if original is None:
+            return None
+        if variant is None:
+            return original, CONTENT_TYPES[match["extension"]], f'"{match["digest"]}"'
+        if variant not in VARIANTS or match["extension"] == "svg":
+            return None
+
+        # The thumbnail size is part of the name, so changing it never serves stale thumbnails.
+        tag = f"thumb{settings.ai.MIND_MAP_THUMBNAIL_SIZE}" if variant == "thumb" else variant
+        variant_name = f"{match['digest']}.{tag}.webp"
+        path = self._files.lookup(variant_name)
+        if path is None:
+            try:
+                with open(original, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                return None
+            self._files.set(variant_name, _make_variant(data, variant))
+            path = self._files.path(variant_name)
+        return path, CONTENT_TYPES["webp"], f'"{match["digest"]}-{tag}"'
+
+
+def _make_variant(data: bytes, variant: str) -> bytes:
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise RuntimeError("Image variants require Pillow") from e
+
+    image = Image.open(io.BytesIO(data))
+    if variant == "thumb":
+        size = settings.ai.MIND_MAP_THUMBNAIL_SIZE
+        image.thumbnail((size, size))
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=80, method=4)
+    return buffer.getvalue()
+
+
+@lru_cache
+def get_image_store() -> ImageStore:
+    return ImageStore(
+        settings.ai.MIND_MAP_OUTPUT_DIR, settings.ai.MIND_MAP_STORE_MAX_BYTES, settings.ai.MIND_MAP_PINNED_DIR
+    )
+
+
+async def store_image(data: bytes, extension: str, pinned: bool = False) -> str:
+    return await asyncio.to_thread(get_image_store().put, data, extension, pinned)
+
+
+async def resolve_image(name: str, variant: str | None = None) -> tuple[str, str, str] | None:
+    return await asyncio.to_thread(get_image_store().resolve, name, variant)
@@ -0,0 +1,292 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.homework_service import HOMEWORK_MODEL, generate_homework
+from app.services.lesson_service import LESSON_MODEL, generate_lesson
+from app.services.mind_map_service import IMAGE_MODEL, generate_mind_map_card
+
+JobHandler = Callable[[dict], Awaitable[dict]]
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+FINISHED = {SUCCEEDED, FAILED}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL
+)
+"""
+_COLUMNS = ("id", "kind", "payload", "status", "result", "error", "created_at", "started_at", "finished_at")
+
+
+class JobStore:
+    """SQLite-backed job table so jobs survive restarts and are visible to every worker."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        try:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+        except sqlite3.OperationalError:
+            pass  # already there
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _execute_count(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def insert(self, job_id: str, kind: str, payload: dict) -> None:
+        self._execute(
+            "INSERT INTO jobs (id, kind, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload), QUEUED, time.time()),
+        )
+
+    def update(self, job_id: str, **fields) -> None:
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> dict | None:
+        rows = self._execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(zip(_COLUMNS, rows[0]))
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def claim(self, job_id: str, now: float) -> bool:
+        """Atomically move a queued job to running; False if another worker or process got it first."""
+        return self._execute_count(
+            "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ? AND status = ?",
+            (RUNNING, now, now, job_id, QUEUED),
+        ) == 1
+
+    def heartbeat(self, job_id: str, now: float) -> None:
+        self._execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (now, job_id, RUNNING))
+
+    def requeue_stale(self, before: float) -> int:
+        """Return running jobs whose lease expired (their worker died) to the queue."""
+        return self._execute_count(
+            "UPDATE jobs SET status = ? WHERE status = ? AND COALESCE(heartbeat_at, started_at, 0) < ?",
+            (QUEUED, RUNNING, before),
+        )
+
+    def queued(self) -> list[tuple[str, str]]:
+        return self._execute("SELECT id, kind FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,))
+
+
+@dataclass
+class JobKind:
+    handler: JobHandler
+    model: str
+
+
+class JobQueue:
+    """In-process job runner with one bounded worker set per upstream model.
+
+    Each model gets its own queue and `JOBS_MODEL_CONCURRENCY[model]` workers,
+    so slow image jobs never starve text jobs. Several processes may share
+    one JOBS_DB_PATH: a worker runs a job only after claiming it in the
+    store, running jobs heartbeat, and a periodic sweep re-queues jobs whose
+    lease (JOBS_LEASE_SECONDS) expired and picks up queued jobs left by
+    other processes.
+    """
+
+    def __init__(self):
+        self._kinds: dict[str, JobKind] = {}
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._workers: list[asyncio.Task] = []
+        # Job ids waiting in a local queue, so sweeps don't enqueue them twice.
+        self._pending: set[str] = set()
+        self._changed: dict[str, asyncio.Event] = {}
+        self._store: JobStore | None = None
+        self.stats = {
+            "submitted": 0,
+            SUCCEEDED: 0,
+            FAILED: 0,
+            "claim_conflicts": 0,
+            "requeued_stale": 0,
+            "wait_seconds_total": 0.0,
+            "run_seconds_total": 0.0,
+        }
+
+    @property
+    def store(self) -> JobStore:
+        if self._store is None:
+            self._store = JobStore(settings.jobs.JOBS_DB_PATH)
+        return self._store
+
+    def register(self, kind: str, handler: JobHandler, model: str) -> None:
+        self._kinds[kind] = JobKind(handler, model)
+
+    async def start(self) -> None:
+        limits = settings.jobs.JOBS_MODEL_CONCURRENCY
+        for model in {kind.model for kind in self._kinds.values()}:
+            self._queues[model] = asyncio.Queue()
+            for _ in range(limits.get(model, 1)):
+                self._workers.append(asyncio.create_task(self._work(model)))
+        await self._sweep()
+        self._workers.append(asyncio.create_task(self._sweep_periodically()))
+
+    def _enqueue(self, job_id: str, kind: str) -> None:
+        if job_id not in self._pending:
+            self._pending.add(job_id)
+            self._queues[self._kinds[kind].model].put_nowait(job_id)
+
+    async def _sweep(self) -> None:
+        lease = settings.jobs.JOBS_LEASE_SECONDS
+        self.stats["requeued_stale"] += await asyncio.to_thread(self.store.requeue_stale, time.time() - lease)
+        for job_id, kind in await asyncio.to_thread(self.store.queued):
+            if kind in self._kinds:
+                self._enqueue(job_id, kind)
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(settings.jobs.JOBS_LEASE_SECONDS / 2)
+            try:
+                await self._sweep()
+            except Exception as e:
+                logger.error("Job sweep failed: {}", e)
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    async def submit(self, kind: str, payload: dict) -> str:
+        if kind not in self._kinds:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid4().hex
+        await asyncio.to_thread(self.store.insert, job_id, kind, payload)
+        self.stats["submitted"] += 1
+        self._enqueue(job_id, kind)
+        return job_id
+
+    async def get(self, job_id: str) -> dict | None:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def watch(self, job_id: str) -> AsyncIterator[dict]:
+        """Yield the job each time its status changes, until it finishes."""
+        last_status = None
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield job
+            if job["status"] in FINISHED:
+                return
+            # Local workers signal changes; polling covers jobs run by other processes.
+            event = self._changed.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), timeout=settings.jobs.JOBS_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            event.clear()
+
+    def _notify(self, job_id: str) -> None:
+        event = self._changed.get(job_id)
+        if event is not None:
+            event.set()
+
+    async def _work(self, model: str) -> None:
+        queue = self._queues[model]
+        while True:
+            job_id = await queue.get()
+            self._pending.discard(job_id)
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                # Store errors must not take the model's worker down with them.
+                logger.error("Job {} could not be run: {}", job_id, e)
+            finally:
+                queue.task_done()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(settings.jobs.JOBS_LEASE_SECONDS / 3)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, job_id, time.time())
+            except Exception as e:
+                logger.warning("Job {} heartbeat failed: {}", job_id, e)
+
+    async def _run(self, job_id: str) -> None:
+        job = await self.get(job_id)
+        if job is None or job["status"] != QUEUED:
+            return
+        started_at = time.time()
+        if not await asyncio.to_thread(self.store.claim, job_id, started_at):
+            self.stats["claim_conflicts"] += 1
+            return
+        self.stats["wait_seconds_total"] += started_at - job["created_at"]
+        self._notify(job_id)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            result = await self._kinds[job["kind"]].handler(job["payload"])
+            fields = {"status": SUCCEEDED, "result": result}
+        except Exception as e:
+            logger.error("Job {} ({}) failed: {}", job_id, job["kind"], e)
+            fields = {"status": FAILED, "error": str(e) or type(e).__name__}
+        finally:
+            heartbeat.cancel()
+
+        finished_at = time.time()
+        self.stats[fields["status"]] += 1
+        self.stats["run_seconds_total"] += finished_at - started_at
+        await asyncio.to_thread(self.store.update, job_id, finished_at=finished_at, **fields)
+        self._notify(job_id)
+        self._changed.pop(job_id, None)
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "queue_depth": {model: queue.qsize() for model, queue in self._queues.items()},
+            "workers": len(self._workers),
+        }
+
+
+async def _mind_map_job(payload: dict) -> dict:
+    return await generate_mind_map_card(payload["material"])
+
+
+async def _homework_job(payload: dict) -> dict:
+    return {"homework": await generate_homework(payload["material"], payload.get("use_materials", False))}
+
+
+async def _lesson_job(payload: dict) -> dict:
+    return {"lesson": await generate_lesson(payload["material"])}
+
+
+job_queue = JobQueue()
+# Mind map cards are limited by their slowest stage, image generation.
+job_queue.register("mind_map", _mind_map_job, model=IMAGE_MODEL)
+job_queue.register("homework", _homework_job, model=HOMEWORK_MODEL)
+job_queue.register("lesson", _lesson_job, model=LESSON_MODEL)
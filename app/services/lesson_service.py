@@ -0,0 +1,29 @@
+from app.core.config import settings
+from app.prompts.assembly import LEARNING_ASSISTANT, assemble_messages, request_options, user_message
+from app.services.openai_client import get_openai_client
+from app.services.upstream import estimate_request_tokens, upstream
+
+LESSON_MODEL = "gpt-4.1-mini"
+
+
+async def generate_lesson(material: str) -> str:
+    """Generate a structured lesson explaining the provided learning material."""
+    messages = assemble_messages(
+        LEARNING_ASSISTANT,
+        turn=[user_message(f"Teach me this material as a structured lesson.\n\nLEARNING MATERIAL:\n\n{material}")],
+    )
+
+    response = await upstream.call(
+        LESSON_MODEL,
+        lambda: get_openai_client().chat.completions.create(
+            model=LESSON_MODEL,
+            messages=messages,
+            temperature=0.4,
+            max_tokens=3000,
+            timeout=settings.ai.OPENAI_TEXT_TIMEOUT,
+            **request_options(LEARNING_ASSISTANT),
+        ),
+        estimated_tokens=estimate_request_tokens(messages, max_tokens=3000),
+    )
+
+    return (response.choices[0].message.content or "").strip()
@@ -0,0 +1,206 @@
+import asyncio
+import os
+import shutil
+import time
+import zipfile
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from uuid import uuid4
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.tracing import span
+from app.services.retrieval_service import get_index, index_material
+from app.utils.file_parser import PARSERS
+from app.utils.parsed_cache import ParsedDocument, ParsedDocumentCache
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_ingest_pool() -> ProcessPoolExecutor:
+    """Bounded process pool shared by all ingestion batches."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.materials.MATERIALS_MAX_WORKERS)
+    return _pool
+
+
+def shutdown_ingest_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _is_supported(path: str) -> bool:
+    return os.path.splitext(path)[1].lower().lstrip(".") in PARSERS
+
+
+def _write_chunk(f, chunk: bytes) -> None:
+    f.write(chunk)
+
+
+async def _save_upload(upload: UploadFile, path: str) -> int:
+    """Copy an upload to disk chunk by chunk, never holding it whole in memory."""
+    cfg = settings.materials
+    size = 0
+    f = await asyncio.to_thread(open, path, "wb")
+    try:
+        while chunk := await upload.read(cfg.MATERIALS_UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > cfg.MATERIALS_MAX_FILE_BYTES:
+                raise ValueError(f"File exceeds {cfg.MATERIALS_MAX_FILE_BYTES} bytes")
+            await asyncio.to_thread(_write_chunk, f, chunk)
+    finally:
+        await asyncio.to_thread(f.close)
+    return size
+
+
+def _extract_zip(archive_path: str, target_dir: str) -> list[str]:
+    """Extract supported members of a course archive, guarding against zip bombs and path traversal."""
+    cfg = settings.materials
+    root = os.path.realpath(target_dir)
+    paths = []
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [
+            m for m in archive.infolist()
+            if not m.is_dir() and _is_supported(m.filename) and not m.filename.startswith("__MACOSX/")
+        ]
+        if len(members) > cfg.MATERIALS_MAX_ZIP_MEMBERS:
+            raise ValueError(f"Archive has more than {cfg.MATERIALS_MAX_ZIP_MEMBERS} files")
+        if sum(m.file_size for m in members) > cfg.MATERIALS_MAX_ZIP_BYTES:
+            raise ValueError(f"Archive expands beyond {cfg.MATERIALS_MAX_ZIP_BYTES} bytes")
+
+        # Declared sizes can lie, so the limit is enforced again on what is written.
+        written = 0
+        for member in members:
+            path = os.path.realpath(os.path.join(root, member.filename))
+            if not path.startswith(root + os.sep):
+                logger.warning("Skipping unsafe archive member {}", member.filename)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with archive.open(member) as src, open(path, "wb") as dst:
+                while chunk := src.read(cfg.MATERIALS_UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > cfg.MATERIALS_MAX_ZIP_BYTES:
+                        raise ValueError(f"Archive expands beyond {cfg.MATERIALS_MAX_ZIP_BYTES} bytes")
+                    dst.write(chunk)
+            paths.append(path)
+    os.remove(archive_path)
+    return paths
+
+
+def _unique_name(name: str, taken: set[str]) -> str:
+    """`name`, or `name-2`, `name-3`... (before the extension) if the batch already has it."""
+    stem, ext = os.path.splitext(name)
+    candidate, n = name, 1
+    while candidate.lower() in taken:
+        n += 1
+        candidate = f"{stem}-{n}{ext}"
+    taken.add(candidate.lower())
+    return candidate
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+async def store_uploads(uploads: list[UploadFile]) -> tuple[str, list[str], list[dict]]:
+    """Save uploaded files (expanding zip archives) into a fresh batch directory.
+
+    Returns the batch id, the stored file paths and rejection events for
+    files that could not be accepted.
+    """
+    batch_id = uuid4().hex
+    batch_dir = os.path.join(settings.materials.MATERIALS_DIR, batch_id)
+    await asyncio.to_thread(os.makedirs, batch_dir, exist_ok=True)
+
+    paths, rejected = [], []
+    # Names (and zip extraction directories, named after the archive) must not collide within a batch.
+    taken: set[str] = set()
+    for upload in uploads:
+        name = os.path.basename(upload.filename or "")
+        is_zip = name.lower().endswith(".zip")
+        if not name or not (is_zip or _is_supported(name)):
+            rejected.append({"event": "rejected", "file": name, "error": "Unsupported file type"})
+            continue
+
+        stored = _unique_name(name, taken)
+        path = os.path.join(batch_dir, stored)
+        extract_dir = os.path.join(batch_dir, os.path.splitext(stored)[0])
+        try:
+            await _save_upload(upload, path)
+            if is_zip:
+                paths.extend(await asyncio.to_thread(_extract_zip, path, extract_dir))
+            else:
+                paths.append(path)
+        except (ValueError, zipfile.BadZipFile) as e:
+            # Drop whatever was written before the limit was hit.
+            await asyncio.to_thread(_remove, path)
+            if is_zip:
+                await asyncio.to_thread(_remove, extract_dir)
+            rejected.append({"event": "rejected", "file": name, "error": str(e)})
+
+    return batch_id, paths, rejected
+
+
+def get_parsed_cache() -> ParsedDocumentCache:
+    return ParsedDocumentCache(settings.materials.MATERIALS_PARSED_CACHE_DIR)
+
+
+def _parse_and_store(path: str) -> dict:
+    """Pool worker: parse one file unless its content hash is already cached."""
+    doc, cached = get_parsed_cache().load(path)
+    return {
+        "sha256": doc.sha256,
+        "parser": doc.parser,
+        "chars": len(doc.text),
+        "segments": len(doc.offsets),
+        "cached": cached,
+    }
+
+
+async def get_parsed_document(sha256: str, parser: str) -> ParsedDocument | None:
+    return await asyncio.to_thread(get_parsed_cache().get, sha256, parser)
+
+
+async def get_document_parsers(sha256: str) -> list[str]:
+    return await asyncio.to_thread(get_parsed_cache().parsers, sha256)
+
+
+async def ingest_files(batch_id: str, paths: list[str]) -> AsyncIterator[dict]:
+    """Parse files on the process pool, yielding a progress event per finished file."""
+    loop = asyncio.get_running_loop()
+    pool = get_ingest_pool()
+    batch_dir = os.path.join(settings.materials.MATERIALS_DIR, batch_id)
+
+    async def run(path: str) -> dict:
+        start = time.perf_counter()
+        event = {"file": os.path.relpath(path, batch_dir)}
+        try:
+            with span("materials.parse"):
+                result = await loop.run_in_executor(pool, _parse_and_store, path)
+            event.update(event="parsed", **result)
+        except Exception as e:
+            logger.warning("Failed to parse {}: {}", path, e)
+            event.update(event="failed", error=str(e) or type(e).__name__)
+        else:
+            if result["sha256"] not in get_index():
+                try:
+                    with span("materials.index"):
+                        event["chunks"] = await index_material(await get_parsed_document(result["sha256"], result["parser"]))
+                except Exception as e:
+                    logger.warning("Failed to index {}: {}", path, e)
+                    event["index_error"] = str(e) or type(e).__name__
+        event["seconds"] = round(time.perf_counter() - start, 3)
+        return event
+
+    total = len(paths)
+    for done, next_event in enumerate(asyncio.as_completed([run(path) for path in paths]), start=1):
+        event = await next_event
+        yield {**event, "done": done, "total": total}
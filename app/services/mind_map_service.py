@@ -1,35 +1,49 @@
+import asyncio
 import os
 import base64
-from datetime import datetime
-from openai import OpenAI
 
-from app.prompts.MIND_MAP_PROMPT import PROMPT_MIND_MAP_SYSTEM
-
-client = OpenAI()
-
-
-def generate_mind_map_text(material: str) -> str:
-    """Generate a Markdown mind map using GPT-4.1."""
-    messages = [
-        {"role": "system", "content": PROMPT_MIND_MAP_SYSTEM},
-        {"role": "user", "content": f"LEARNING MATERIAL:\n\n{material}"}
-    ]
-
-    response = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=messages,
-        temperature=0.2,
-        max_tokens=1500,
+from app.core.config import settings
+from app.core.tracing import span
+from app.prompts.assembly import MIND_MAP, assemble_messages, request_options, user_message
+from app.services.image_store import store_image
+from app.services.openai_client import get_openai_client
+from app.services.upstream import estimate_request_tokens, upstream
+from app.utils.cache import ResultCache, make_cache_key
+from app.utils.chunker import split_text
+from app.utils.mind_map_render import render_png, render_svg
+from app.utils.mind_map_tree import merge_trees, parse_markdown_tree, render_markdown
+from app.utils.singleflight import SingleFlight
+from app.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+TEXT_MODEL = "gpt-4.1-mini"
+TEXT_PARAMS = {"temperature": 0.2, "max_tokens": 1500}
+IMAGE_MODEL = "gpt-image-1"
+IMAGE_PARAMS = {"size": "1024x1024"}
+
+
+def _make_cache(name: str) -> ResultCache:
+    cfg = settings.cache
+    return ResultCache(
+        name,
+        directory=cfg.CACHE_DIR,
+        memory_items=cfg.CACHE_MEMORY_ITEMS,
+        memory_max_bytes=cfg.CACHE_MEMORY_MAX_BYTES,
+        disk_max_bytes=cfg.CACHE_DISK_MAX_BYTES,
+        ttl=cfg.CACHE_TTL_SECONDS,
     )
 
-    return (response.choices[0].message.content or "").strip()
 
+text_cache = _make_cache("text")
+image_cache = _make_cache("image")
+
+# Identical requests arriving together (e.g. a whole class with one handout)
+# share a single upstream call per stage.
+text_flight = SingleFlight("text")
+image_flight = SingleFlight("image")
 
-def generate_mind_map_image(mind_map_text: str, output_dir="mind_maps") -> str:
-    """Generate a mind map image using gpt-image-1."""
-    os.makedirs(output_dir, exist_ok=True)
 
-    visual_prompt = (
+def _visual_prompt(mind_map_text: str) -> str:
+    return (
         "Create a clean, readable mind map card. "
         "Use nodes with short labels connected by lines. "
         "Follow this structure exactly:\n\n"
@@ -37,35 +51,152 @@ def generate_mind_map_image(mind_map_text: str, output_dir="mind_maps") -> str:
         "Style: minimalistic, white background, soft pastel colors, rounded shapes."
     )
 
-    response = client.images.generate(
-        model="gpt-image-1",
-        prompt=visual_prompt,
-        size="1024x1024",
+
+async def generate_mind_map_text(material: str) -> str:
+    """Generate a Markdown mind map using GPT-4.1."""
+    with span("mind_map.text"):
+        if estimate_tokens(material) > settings.ai.MIND_MAP_CHUNK_TOKENS:
+            return await generate_long_mind_map_text(material)
+        return await _generate_chunk_mind_map_text(material)
+
+
+async def generate_long_mind_map_text(material: str) -> str:
+    """Map-reduce mode for long materials.
+
+    The material is split into token-budgeted chunks, partial mind maps are
+    generated concurrently (bounded by MIND_MAP_MAX_PARALLEL_CHUNKS) and
+    merged into one tree locally, without another model pass.
+    """
+    ai = settings.ai
+    chunks = split_text(material, ai.MIND_MAP_CHUNK_TOKENS * CHARS_PER_TOKEN)
+    semaphore = asyncio.Semaphore(ai.MIND_MAP_MAX_PARALLEL_CHUNKS)
+
+    async def map_chunk(chunk: str) -> str:
+        async with semaphore:
+            return await _generate_chunk_mind_map_text(chunk)
+
+    partials = await asyncio.gather(*(map_chunk(chunk) for chunk in chunks))
+    with span("mind_map.merge"):
+        tree = merge_trees([parse_markdown_tree(partial) for partial in partials if partial])
+        return render_markdown(tree)
+
+
+async def _generate_chunk_mind_map_text(material: str) -> str:
+    key = make_cache_key(
+        "text", material, prompt=MIND_MAP.id, model=TEXT_MODEL, **TEXT_PARAMS
     )
+    if settings.cache.CACHE_ENABLED and (cached := await text_cache.get(key)) is not None:
+        return cached.decode()
 
-    image_b64 = response.data[0].b64_json
-    image_bytes = base64.b64decode(image_b64)
+    return await text_flight.do(key, lambda: _request_mind_map_text(key, material))
+
+
+async def _request_mind_map_text(key: str, material: str) -> str:
+    messages = assemble_messages(MIND_MAP, turn=[user_message(f"LEARNING MATERIAL:\n\n{material}")])
+
+    response = await upstream.call(
+        TEXT_MODEL,
+        lambda: get_openai_client().chat.completions.create(
+            model=TEXT_MODEL,
+            messages=messages,
+            timeout=settings.ai.OPENAI_TEXT_TIMEOUT,
+            **TEXT_PARAMS,
+            **request_options(MIND_MAP),
+        ),
+        estimated_tokens=estimate_request_tokens(messages, max_tokens=TEXT_PARAMS["max_tokens"]),
+    )
 
-    filename = f"mindmap_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-    path = os.path.join(output_dir, filename)
+    mind_map_text = (response.choices[0].message.content or "").strip()
+    if settings.cache.CACHE_ENABLED and mind_map_text:
+        await text_cache.set(key, mind_map_text.encode())
+    return mind_map_text
 
-    with open(path, "wb") as f:
-        f.write(image_bytes)
 
-    return path
+async def _generate_image_bytes(mind_map_text: str) -> bytes:
+    visual_prompt = _visual_prompt(mind_map_text)
+    # Indentation is the tree's structure, so the prompt is hashed as is.
+    key = make_cache_key("image", visual_prompt, normalize=False, model=IMAGE_MODEL, **IMAGE_PARAMS)
+    if settings.cache.CACHE_ENABLED and (cached := await image_cache.get(key)) is not None:
+        return cached
 
+    return await image_flight.do(key, lambda: _request_image_bytes(key, visual_prompt))
 
-def generate_mind_map_card(material: str):
+
+async def _request_image_bytes(key: str, visual_prompt: str) -> bytes:
+    response = await upstream.call(
+        IMAGE_MODEL,
+        lambda: get_openai_client().images.generate(
+            model=IMAGE_MODEL,
+            prompt=visual_prompt,
+            timeout=settings.ai.OPENAI_IMAGE_TIMEOUT,
+            **IMAGE_PARAMS,
+        ),
+    )
+
+    # Decoding 1-2 MB of base64 stays off the event loop.
+    with span("mind_map.decode"):
+        image_bytes = await asyncio.to_thread(base64.b64decode, response.data[0].b64_json)
+    if settings.cache.CACHE_ENABLED:
+        await image_cache.set(key, image_bytes)
+    return image_bytes
+
+
+def image_url(image_path: str) -> str:
+    return f"/api/mindmap/images/{os.path.basename(image_path)}"
+
+
+def render_local_image(mind_map_text: str, image_format: str = "png") -> bytes:
+    """Render the Markdown tree locally (radial layout), no network call."""
+    tree = parse_markdown_tree(mind_map_text)
+    if image_format == "svg":
+        return render_svg(tree).encode()
+    return render_png(tree)
+
+
+async def generate_mind_map_image(
+    mind_map_text: str,
+    renderer: str = "artistic",
+    image_format: str = "png",
+    pinned: bool = False,
+) -> str:
+    """Generate a mind map image using gpt-image-1 ("artistic") or the local renderer ("local").
+
+    Returns the image's path in the content-addressed image store; `pinned`
+    images are never evicted.
+    """
+    if renderer == "local":
+        with span("mind_map.render"):
+            image_bytes = await asyncio.to_thread(render_local_image, mind_map_text, image_format)
+    else:
+        image_format = "png"
+        with span("mind_map.image"):
+            image_bytes = await _generate_image_bytes(mind_map_text)
+
+    with span("mind_map.store"):
+        return await store_image(image_bytes, image_format, pinned)
+
+
+async def generate_mind_map_card(material: str, renderer: str = "artistic", image_format: str = "png"):
     """
     Full pipeline:
     1. Convert learning material → Markdown mind map
     2. Convert Markdown mind map → image
     Returns dict for DTO model.
     """
-    mind_map_text = generate_mind_map_text(material)
-    image_path = generate_mind_map_image(mind_map_text)
+    with span("mind_map.card"):
+        mind_map_text = await generate_mind_map_text(material)
+        image_path = await generate_mind_map_image(mind_map_text, renderer=renderer, image_format=image_format)
 
     return {
         "mind_map_text": mind_map_text,
-        "image_path": image_path
+        "image_path": image_path,
+        "image_url": image_url(image_path),
     }
+
+
+def cache_stats() -> dict[str, dict]:
+    return {"text": text_cache.snapshot(), "image": image_cache.snapshot()}
+
+
+def coalescing_stats() -> dict[str, dict]:
+    return {"text": text_flight.snapshot(), "image": image_flight.snapshot()}
@@ -0,0 +1,138 @@
+import asyncio
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.tracing import span
+from app.models.mind_map import MindMapDocument, MindMapVersion
+from app.prompts.assembly import MIND_MAP_UPDATE, assemble_messages, request_options, user_message
+from app.repos.mind_map_repo import MindMapRepo
+from app.services.mind_map_service import TEXT_MODEL, TEXT_PARAMS, generate_mind_map_image, generate_mind_map_text
+from app.services.openai_client import get_openai_client
+from app.services.upstream import estimate_request_tokens, upstream
+from app.utils.mind_map_tree import MindMap, MindMapDiff, parse_markdown_tree, render_markdown
+
+
+async def create_mind_map(material: str, renderer: str = "artistic", image_format: str = "png") -> MindMapVersion:
+    """Generate a mind map as in `generate_mind_map_card` and store it as version 1."""
+    with span("mind_map.card"):
+        tree = MindMap.from_markdown(await generate_mind_map_text(material))
+        image_path = await generate_mind_map_image(
+            tree.to_markdown(), renderer=renderer, image_format=image_format, pinned=True
+        )
+    # The artistic renderer always produces PNG.
+    image_format = image_format if renderer == "local" else "png"
+    async with session_scope() as db:
+        return await MindMapRepo(db).create(renderer, image_format, tree.to_dict(), image_path)
+
+
+async def _request_mind_map_delta(tree: MindMap, material: str) -> str:
+    """Ask the model for the changes the new material makes, given the compact tree instead of the old material."""
+    messages = assemble_messages(
+        MIND_MAP_UPDATE,
+        # The tree is context for the new material, which is the turn.
+        stable=[f"CURRENT MIND MAP:\n\n{tree.to_compact()}"],
+        turn=[user_message(f"NEW MATERIAL:\n\n{material}")],
+    )
+    response = await upstream.call(
+        TEXT_MODEL,
+        lambda: get_openai_client().chat.completions.create(
+            model=TEXT_MODEL,
+            messages=messages,
+            timeout=settings.ai.OPENAI_TEXT_TIMEOUT,
+            **TEXT_PARAMS,
+            **request_options(MIND_MAP_UPDATE),
+        ),
+        estimated_tokens=estimate_request_tokens(messages, max_tokens=TEXT_PARAMS["max_tokens"]),
+    )
+    return (response.choices[0].message.content or "").strip()
+
+
+async def _render_changes(
+    document: MindMapDocument, previous: MindMapVersion, tree: MindMap, diff: MindMapDiff, rendered: dict[str, str]
+) -> tuple[str, int, dict]:
+    """Image path, image version and branch images for the next version.
+
+    Either the whole map is redrawn (when the root changed, when the local
+    renderer is used, milliseconds, or when too many branches changed for
+    per-branch rendering to be cheaper) and the branch images are cleared,
+    or only the first-level branches the diff touched are rendered and the
+    whole-map image is kept. Images are pinned so stored versions never
+    point at evicted files. `rendered` maps Markdown to image paths already
+    produced by this update, so a retry does not pay for them again.
+    """
+    changed = {tree.branch_id(node_id) for node_id in diff.node_ids()}
+    branches = sorted(changed - {tree.root.id})
+
+    async def render(markdown: str) -> str:
+        if markdown not in rendered:
+            rendered[markdown] = await generate_mind_map_image(
+                markdown, document.renderer, document.image_format, pinned=True
+            )
+        return rendered[markdown]
+
+    if (
+        tree.root.id in changed
+        or document.renderer == "local"
+        or len(branches) > settings.ai.MIND_MAP_MAX_BRANCH_RENDERS
+    ):
+        return await render(tree.to_markdown()), previous.version + 1, {}
+
+    branch_images = {key: path for key, path in previous.branch_images.items() if key not in changed}
+    images = await asyncio.gather(*(render(render_markdown(tree.find(branch))) for branch in branches))
+    branch_images.update(zip(branches, images))
+    return previous.image_path, previous.image_version, branch_images
+
+
+async def _load_latest(mind_map_id: UUID) -> tuple[MindMapDocument, MindMapVersion] | None:
+    async with session_scope() as db:
+        repo = MindMapRepo(db)
+        document = await repo.get(mind_map_id)
+        if document is None:
+            return None
+        return document, await repo.get_version(mind_map_id, document.version)
+
+
+async def append_to_mind_map(mind_map_id: UUID, material: str) -> tuple[MindMapVersion, MindMapDiff] | None:
+    """Extend a stored mind map with new material and store the result as the next version.
+
+    The model sees only the new material and the compact tree, and answers
+    with a delta that is merged locally. Returns the latest version and the
+    diff (empty, with no new version, if nothing changed); None if the map
+    does not exist.
+    """
+    loaded = await _load_latest(mind_map_id)
+    if loaded is None:
+        return None
+    document, current = loaded
+
+    with span("mind_map.delta"):
+        delta = parse_markdown_tree(await _request_mind_map_delta(MindMap.from_dict(current.tree), material))
+
+    rendered: dict[str, str] = {}
+    for attempt in range(2):
+        tree = MindMap.from_dict(current.tree)
+        diff = tree.apply_delta(delta)
+        if not diff:
+            return current, diff
+        image_path, image_version, branch_images = await _render_changes(document, current, tree, diff, rendered)
+        try:
+            async with session_scope() as db:
+                row = await MindMapRepo(db).add_version(
+                    mind_map_id,
+                    current.version + 1,
+                    tree.to_dict(),
+                    diff.to_dict(),
+                    image_path,
+                    image_version,
+                    branch_images,
+                )
+            return row, diff
+        except IntegrityError:
+            if attempt:
+                raise
+            # Another update stored this version first; ids are never reused,
+            # so the same delta can be merged into the newer tree.
+            document, current = await _load_latest(mind_map_id)
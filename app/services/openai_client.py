@@ -0,0 +1,41 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+@lru_cache
+def get_openai_client() -> "AsyncOpenAI":
+    """Shared AsyncOpenAI client with a pooled HTTP connection pool.
+
+    The SDK is imported on first use; it is the largest import in the app.
+    """
+    import httpx
+    from openai import AsyncOpenAI
+
+    ai = settings.ai
+    timeout = httpx.Timeout(ai.OPENAI_TIMEOUT, connect=ai.OPENAI_CONNECT_TIMEOUT)
+    http_client = httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=ai.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=ai.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+    return AsyncOpenAI(
+        api_key=ai.OPENAI_API_KEY,
+        base_url=ai.OPENAI_BASE_URL,
+        timeout=timeout,
+        max_retries=ai.OPENAI_MAX_RETRIES,
+        http_client=http_client,
+    )
+
+
+async def close_openai_client() -> None:
+    """Close the shared client's connections (called on app shutdown)."""
+    if get_openai_client.cache_info().currsize:
+        await get_openai_client().close()
+        get_openai_client.cache_clear()
@@ -0,0 +1,58 @@
+import asyncio
+from dataclasses import asdict
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+from app.core.tracing import span
+from app.services.embeddings import Embedder, get_embedder
+from app.utils.chunker import chunk_document
+from app.utils.parsed_cache import ParsedDocument
+
+if TYPE_CHECKING:
+    from app.utils.vector_index import VectorIndex
+
+
+@lru_cache
+def get_index() -> "VectorIndex":
+    # Deferred so numpy loads with the index rather than at app import.
+    from app.utils.vector_index import VectorIndex
+
+    cfg = settings.retrieval
+    return VectorIndex(
+        cfg.RETRIEVAL_INDEX_DIR,
+        dim=cfg.RETRIEVAL_EMBEDDING_DIM,
+        ivf_threshold=cfg.RETRIEVAL_IVF_THRESHOLD,
+        nprobe=cfg.RETRIEVAL_NPROBE,
+    )
+
+
+async def index_material(doc: ParsedDocument, embedder: Embedder | None = None) -> int:
+    """Chunk, embed and (re)index one material. Returns the number of chunks."""
+    cfg = settings.retrieval
+    chunks = chunk_document(doc, cfg.RETRIEVAL_CHUNK_CHARS, cfg.RETRIEVAL_CHUNK_OVERLAP)
+    if not chunks:
+        return 0
+    vectors = await (embedder or get_embedder())([chunk.text for chunk in chunks])
+    rows = [{k: v for k, v in asdict(chunk).items() if k != "material_id"} for chunk in chunks]
+    await asyncio.to_thread(get_index().add, doc.sha256, rows, vectors)
+    return len(chunks)
+
+
+async def remove_material(material_id: str) -> int:
+    return await asyncio.to_thread(get_index().delete, material_id)
+
+
+async def retrieve(query: str, k: int | None = None, embedder: Embedder | None = None) -> list[dict]:
+    """Top-k material chunks for a query, best first."""
+    with span("retrieval.embed"):
+        vectors = await (embedder or get_embedder())([query])
+    with span("retrieval.search"):
+        hits = await asyncio.to_thread(get_index().search, vectors[0], k or settings.retrieval.RETRIEVAL_TOP_K)
+    return [{**row, "score": score} for score, row in hits]
+
+
+async def build_context(query: str, k: int | None = None) -> str:
+    """Relevant chunks formatted for a prompt, instead of the whole material."""
+    chunks = await retrieve(query, k)
+    return "\n\n".join(f"[{chunk['material_id'][:12]}:{chunk['start']}]\n{chunk['text']}" for chunk in chunks)
@@ -0,0 +1,259 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.logger import logger
+from app.core.tracing import span
+from app.prompts.assembly import MODE_PROMPTS, SESSION_SUMMARY, assemble_messages, request_options, user_message
+from app.repos.session_repo import SessionRepo
+from app.services.chat_service import material_context_message, stream_completion
+from app.services.openai_client import get_openai_client
+from app.services.upstream import estimate_request_tokens, upstream
+from app.utils.tokens import estimate_tokens
+
+
+@dataclass
+class Turn:
+    seq: int
+    role: str
+    content: str
+    tokens: int
+
+
+@dataclass
+class SessionState:
+    """In-memory view of an active session: the rolling summary plus the turns not yet folded into it."""
+
+    id: UUID
+    mode: str
+    summary: str = ""
+    summary_through: int = 0
+    turn_count: int = 0
+    turns: list[Turn] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    compacting: bool = False
+
+    @property
+    def pending_tokens(self) -> int:
+        return sum(turn.tokens for turn in self.turns)
+
+
+async def _summarize(summary: str, turns: list[Turn]) -> str:
+    """Fold `turns` into the existing summary (incremental, never re-reads older turns)."""
+    cfg = settings.session
+    transcript = "\n\n".join(f"{turn.role.upper()}: {turn.content}" for turn in turns)
+    messages = assemble_messages(
+        SESSION_SUMMARY,
+        turn=[user_message(f"CURRENT SUMMARY:\n\n{summary or '(empty)'}\n\nNEW TURNS:\n\n{transcript}")],
+    )
+    response = await upstream.call(
+        cfg.SESSION_SUMMARY_MODEL,
+        lambda: get_openai_client().chat.completions.create(
+            model=cfg.SESSION_SUMMARY_MODEL,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=cfg.SESSION_SUMMARY_TOKENS,
+            timeout=settings.ai.OPENAI_TEXT_TIMEOUT,
+            **request_options(SESSION_SUMMARY),
+        ),
+        estimated_tokens=estimate_request_tokens(messages, max_tokens=cfg.SESSION_SUMMARY_TOKENS),
+    )
+    return (response.choices[0].message.content or "").strip() or summary
+
+
+class SessionStore:
+    """Tutoring sessions persisted in Postgres with a hot in-memory cache.
+
+    Prompts are built from the system prompt, the session's rolling summary
+    and the newest turns within SESSION_WINDOW_TOKENS, so prompt size stays
+    bounded however long a session runs. Once the unsummarized turns exceed
+    the window, the oldest of them are folded into the summary by a
+    background task, leaving half the window verbatim.
+
+    The cache assumes a session's turns are written through one worker at a
+    time (sticky sessions); a turn written elsewhere shows up as a seq
+    conflict, which reloads the session from the database.
+    """
+
+    def __init__(self):
+        self._cache: OrderedDict[UUID, SessionState] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "turns": 0,
+            "seq_conflicts": 0,
+            "compactions": 0,
+            "compaction_failures": 0,
+            "prompt_tokens_last": 0,
+        }
+
+    def _remember(self, state: SessionState) -> None:
+        self._cache[state.id] = state
+        self._cache.move_to_end(state.id)
+        while len(self._cache) > settings.session.SESSION_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def _load(self, session_id: UUID) -> SessionState | None:
+        async with session_scope() as db:
+            repo = SessionRepo(db)
+            row = await repo.get(session_id)
+            if row is None:
+                return None
+            turns = await repo.turns_after(session_id, row.summary_through)
+        return SessionState(
+            id=row.id,
+            mode=row.mode,
+            summary=row.summary,
+            summary_through=row.summary_through,
+            turn_count=row.turn_count,
+            turns=[Turn(turn.seq, turn.role, turn.content, turn.tokens) for turn in turns],
+        )
+
+    async def create(self, mode: str) -> SessionState:
+        async with session_scope() as db:
+            row = await SessionRepo(db).create(mode)
+        state = SessionState(id=row.id, mode=row.mode)
+        self._remember(state)
+        return state
+
+    async def get(self, session_id: UUID) -> SessionState | None:
+        state = self._cache.get(session_id)
+        if state is not None:
+            self.stats["cache_hits"] += 1
+            self._cache.move_to_end(session_id)
+            return state
+        self.stats["cache_misses"] += 1
+        state = await self._load(session_id)
+        if state is not None:
+            self._remember(state)
+        return state
+
+    async def append(self, state: SessionState, *messages: tuple[str, str]) -> list[Turn]:
+        """Store (role, content) messages as consecutive turns, all or none."""
+        async with state.lock:
+            for attempt in range(2):
+                turns = [
+                    Turn(state.turn_count + i, role, content, estimate_tokens(content))
+                    for i, (role, content) in enumerate(messages, start=1)
+                ]
+                try:
+                    async with session_scope() as db:
+                        repo = SessionRepo(db)
+                        for turn in turns:
+                            await repo.add_turn(state.id, turn.seq, turn.role, turn.content, turn.tokens)
+                    break
+                except IntegrityError:
+                    self.stats["seq_conflicts"] += 1
+                    fresh = await self._load(state.id)
+                    if attempt or fresh is None:
+                        raise
+                    state.summary, state.summary_through = fresh.summary, fresh.summary_through
+                    state.turn_count, state.turns = fresh.turn_count, fresh.turns
+            state.turns.extend(turns)
+            state.turn_count = turns[-1].seq
+        self.stats["turns"] += len(turns)
+        self._schedule_compaction(state)
+        return turns
+
+    def build_messages(self, state: SessionState, content: str, context: dict | None = None) -> list[dict]:
+        """System prompt, rolling summary, the newest turns within budget, then material context and the new `content`.
+
+        The summary only changes on compaction, which also keeps every
+        unsummarized turn inside the window, so consecutive turns share a
+        cacheable prefix that ends at the previous turn.
+        """
+        window: list[Turn] = []
+        budget = settings.session.SESSION_WINDOW_TOKENS
+        pending = Turn(state.turn_count + 1, "user", content, estimate_tokens(content))
+        # The newest turn is always sent, even if it alone exceeds the budget.
+        for turn in reversed([*state.turns, pending]):
+            if window and turn.tokens > budget:
+                break
+            window.append(turn)
+            budget -= turn.tokens
+        turns = [{"role": turn.role, "content": turn.content} for turn in reversed(window)]
+        messages = assemble_messages(
+            MODE_PROMPTS[state.mode],
+            stable=[f"SESSION SUMMARY (earlier turns):\n\n{state.summary}" if state.summary else ""],
+            history=turns[:-1],
+            turn=[context, *turns[-1:]] if context is not None else turns[-1:],
+        )
+        self.stats["prompt_tokens_last"] = estimate_request_tokens(messages)
+        return messages
+
+    def _schedule_compaction(self, state: SessionState) -> None:
+        if state.compacting or state.pending_tokens <= settings.session.SESSION_WINDOW_TOKENS:
+            return
+        state.compacting = True
+        task = asyncio.create_task(self._compact(state))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _compact(self, state: SessionState) -> None:
+        keep = settings.session.SESSION_WINDOW_TOKENS // 2
+        succeeded = False
+        try:
+            folded, remaining = [], state.pending_tokens
+            for turn in state.turns:
+                if remaining <= keep:
+                    break
+                folded.append(turn)
+                remaining -= turn.tokens
+            if not folded:
+                return
+
+            with span("session.summarize"):
+                summary = await _summarize(state.summary, folded)
+            through = folded[-1].seq
+            async with session_scope() as db:
+                await SessionRepo(db).save_summary(state.id, summary, through)
+            state.summary, state.summary_through = summary, through
+            state.turns = [turn for turn in state.turns if turn.seq > through]
+            self.stats["compactions"] += 1
+            succeeded = True
+        except Exception as e:
+            self.stats["compaction_failures"] += 1
+            logger.warning("Session {} compaction failed: {}", state.id, e)
+        finally:
+            state.compacting = False
+        if succeeded:
+            # Turns added while summarizing may already need another pass.
+            self._schedule_compaction(state)
+
+    async def stop(self) -> None:
+        """Cancel in-flight compactions; they are redone after the next turn."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "cached_sessions": len(self._cache), "compactions_in_flight": len(self._tasks)}
+
+
+session_store = SessionStore()
+
+
+async def stream_session_reply(state: SessionState, content: str, use_materials: bool = False) -> AsyncIterator[str]:
+    """Stream the tutor's reply to the learner's turn and record both once the reply is complete.
+
+    Nothing is stored if the upstream call fails or the client goes away, so
+    a session never keeps a question without its answer.
+    """
+    with span("session.build_messages"):
+        context = await material_context_message(content) if use_materials else None
+        messages = session_store.build_messages(state, content, context)
+
+    async def save_reply(reply: str) -> None:
+        await session_store.append(state, ("user", content), *([("assistant", reply)] if reply else []))
+
+    async with aclosing(stream_completion(messages, state.mode, on_reply=save_reply)) as frames:
+        async for frame in frames:
+            yield frame
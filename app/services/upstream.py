@@ -0,0 +1,233 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from typing import TypeVar
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.tracing import record_usage, span
+from app.utils.tokens import estimate_tokens
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailableError(Exception):
+    """The model provider is rate limiting or failing and retries are exhausted."""
+
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(f"Upstream model {model} is unavailable, retry in {retry_after:.0f}s")
+        self.model = model
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute / 60` per second.
+
+    The refill rate adapts: it is halved on every 429 and recovers additively
+    on success (AIMD), so bursts back off before the provider has to reject them.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.max_rate = per_minute / 60
+        self.rate = self.max_rate
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float) -> float:
+        """Wait until `amount` tokens are available; returns the time spent waiting."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # The lock keeps waiters FIFO so large requests are not starved.
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def adjust(self, delta: float) -> None:
+        """Correct an estimate once the real usage is known (negative refunds)."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - delta)
+
+    def slow_down(self) -> None:
+        self.rate = max(self.max_rate / 10, self.rate / 2)
+
+    def speed_up(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class CircuitBreaker:
+    """Opens after consecutive upstream failures; lets one probe through after `reset_timeout`."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "half_open":
+            # Re-arm so only one probe goes out per reset period.
+            self.opened_at = time.monotonic()
+        return state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class _ModelLimits:
+    def __init__(self, model: str):
+        cfg = settings.upstream
+        limits = cfg.UPSTREAM_LIMITS.get(model, {})
+        self.requests = TokenBucket(limits.get("rpm", cfg.UPSTREAM_DEFAULT_RPM))
+        self.tokens = TokenBucket(limits.get("tpm", cfg.UPSTREAM_DEFAULT_TPM))
+        self.breaker = CircuitBreaker(cfg.UPSTREAM_BREAKER_FAILURES, cfg.UPSTREAM_BREAKER_RESET_SECONDS)
+        self.stats = {"calls": 0, "retries": 0, "rate_limited": 0, "failures": 0, "rejected": 0, "wait_seconds_total": 0.0}
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Seconds requested by the provider via `retry-after-ms` / `Retry-After`."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    if value := headers.get("retry-after-ms"):
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    if value := headers.get("retry-after"):
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Imported here so the SDK loads with the first client, not at app import.
+    import openai
+
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in (408, 409)
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    import openai
+
+    return isinstance(error, openai.RateLimitError)
+
+
+def estimate_request_tokens(messages: list[dict] | None = None, prompt: str = "", max_tokens: int = 0) -> int:
+    """Pre-estimate a request's token cost from its prompt and completion budget."""
+    text = prompt + "".join(str(message.get("content") or "") for message in messages or [])
+    return estimate_tokens(text) + max_tokens
+
+
+class UpstreamScheduler:
+    """Single gateway for model calls: per-model RPM/TPM buckets, retries, circuit breaker."""
+
+    def __init__(self):
+        self._models: dict[str, _ModelLimits] = {}
+
+    def _limits(self, model: str) -> _ModelLimits:
+        if model not in self._models:
+            self._models[model] = _ModelLimits(model)
+        return self._models[model]
+
+    async def call(self, model: str, fn: Callable[[], Awaitable[T]], estimated_tokens: int = 0) -> T:
+        cfg = settings.upstream
+        limits = self._limits(model)
+
+        for attempt in range(cfg.UPSTREAM_MAX_RETRIES + 1):
+            if not limits.breaker.allow():
+                limits.stats["rejected"] += 1
+                raise UpstreamUnavailableError(model, limits.breaker.retry_after())
+
+            with span("upstream.wait"):
+                waited = await limits.requests.acquire(1)
+                waited += await limits.tokens.acquire(estimated_tokens)
+            limits.stats["wait_seconds_total"] += waited
+            limits.stats["calls"] += 1
+            try:
+                with span(f"openai.{model}"):
+                    result = await fn()
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                if _is_rate_limit(e):
+                    limits.stats["rate_limited"] += 1
+                    limits.requests.slow_down()
+                    limits.tokens.slow_down()
+                else:
+                    limits.stats["failures"] += 1
+                    limits.breaker.record_failure()
+
+                retry_after = _retry_after(e)
+                # Full jitter keeps many workers from retrying in lockstep.
+                backoff = random.uniform(0, min(cfg.UPSTREAM_BACKOFF_MAX, cfg.UPSTREAM_BACKOFF_BASE * 2 ** attempt))
+                delay = max(retry_after or 0.0, backoff)
+                if attempt == cfg.UPSTREAM_MAX_RETRIES:
+                    raise UpstreamUnavailableError(model, max(delay, limits.breaker.retry_after())) from e
+                limits.stats["retries"] += 1
+                logger.warning("{} call failed ({}), retry {} in {:.2f}s", model, type(e).__name__, attempt + 1, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            limits.breaker.record_success()
+            limits.requests.speed_up()
+            limits.tokens.speed_up()
+            usage = getattr(result, "usage", None)
+            record_usage(model, usage)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                limits.tokens.adjust(usage.total_tokens - estimated_tokens)
+            return result
+
+    def snapshot(self) -> dict:
+        return {
+            model: {
+                **limits.stats,
+                "breaker": limits.breaker.state,
+                "rpm_rate": round(limits.requests.rate * 60, 2),
+                "tpm_rate": round(limits.tokens.rate * 60, 2),
+            }
+            for model, limits in self._models.items()
+        }
+
+
+upstream = UpstreamScheduler()
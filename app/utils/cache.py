@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+_WHITESPACE = re.compile(r"[ \t\f\v]+")
+
+
+def normalize_material(material: str) -> str:
+    """Normalize text so cosmetic differences (spacing, line endings) share a cache key."""
+    material = unicodedata.normalize("NFC", material)
+    lines = (_WHITESPACE.sub(" ", line).strip() for line in material.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def make_cache_key(kind: str, payload: str, *, normalize: bool = True, **params: Any) -> str:
+    """SHA-256 over the payload and everything that affects the output.
+
+    Pass `normalize=False` when whitespace is meaningful, e.g. the indentation
+    of a Markdown tree.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"kind": kind, **params}, sort_keys=True).encode())
+    digest.update(b"\0")
+    digest.update((normalize_material(payload) if normalize else payload).encode())
+    return digest.hexdigest()
+
+
+class MemoryLRU:
+    """In-process LRU bounded by item count and total bytes, with TTL expiry."""
+
+    def __init__(self, max_items: int, max_bytes: int, ttl: float):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._items: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> bytes | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if time.monotonic() > expires_at:
+            self._bytes -= len(self._items.pop(key)[1])
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes) -> int:
+        if len(value) > self.max_bytes:
+            return 0
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old[1])
+        self._items[key] = (time.monotonic() + self.ttl, value)
+        self._bytes += len(value)
+
+        evicted = 0
+        while len(self._items) > self.max_items or self._bytes > self.max_bytes:
+            _, (_, dropped) = self._items.popitem(last=False)
+            self._bytes -= len(dropped)
+            evicted += 1
+        return evicted
+
+
+class DiskCache:
+    """Directory-backed cache bounded by total size, with TTL expiry.
+
+    The size index is built lazily from the directory on first use so several
+    workers can share one cache directory; files removed by another worker are
+    tolerated.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] | None = None
+        self._bytes = 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            entries = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, name, stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((name, size) for _, name, size in entries)
+            self._bytes = sum(self._index.values())
+        return self._index
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def _lookup(self, key: str) -> str | None:
+        index = self._load_index()
+        path = self.path(key)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._bytes -= index.pop(key, 0)
+            return None
+        if time.time() - stat.st_mtime > self.ttl:
+            self._remove(key)
+            return None
+        self._bytes += stat.st_size - index.pop(key, 0)
+        index[key] = stat.st_size
+        return path
+
+    def lookup(self, key: str) -> str | None:
+        """Path of a fresh entry, marked as recently used, without reading it."""
+        with self._lock:
+            return self._lookup(key)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            path = self._lookup(key)
+            if path is None:
+                return None
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                self._bytes -= self._index.pop(key, 0)
+                return None
+
+    def set(self, key: str, value: bytes) -> int:
+        if len(value) > self.max_bytes:
+            return 0
+        with self._lock:
+            index = self._load_index()
+            path = self.path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+
+            self._bytes += len(value) - index.pop(key, 0)
+            index[key] = len(value)
+
+            evicted = 0
+            while self._bytes > self.max_bytes and len(index) > 1:
+                self._remove(next(iter(index)))
+                evicted += 1
+            return evicted
+
+
+class ResultCache:
+    """Two-tier (memory LRU → disk) cache for generated artifacts."""
+
+    def __init__(
+        self,
+        name: str,
+        directory: str,
+        memory_items: int,
+        memory_max_bytes: int,
+        disk_max_bytes: int,
+        ttl: float,
+    ):
+        self.name = name
+        self.memory = MemoryLRU(memory_items, memory_max_bytes, ttl)
+        self.disk = DiskCache(os.path.join(directory, name), disk_max_bytes, ttl)
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+
+    async def get(self, key: str) -> bytes | None:
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+
+        value = await asyncio.to_thread(self.disk.get, key)
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["disk_hits"] += 1
+        self.stats["evictions"] += self.memory.set(key, value)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        self.stats["sets"] += 1
+        self.stats["evictions"] += self.memory.set(key, value)
+        self.stats["evictions"] += await asyncio.to_thread(self.disk.set, key, value)
+
+    def snapshot(self) -> dict[str, int | float]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {**self.stats, "hit_ratio": hits / lookups if lookups else 0.0}
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+
+from app.utils.parsed_cache import ParsedDocument
+
+_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+@dataclass
+class Chunk:
+    material_id: str
+    text: str
+    start: int
+    end: int
+
+
+def _break_point(text: str, start: int, limit: int, boundaries: list[int]) -> int:
+    """Best place to end a chunk in (start, limit]: a page/paragraph end, then a separator."""
+    floor = start + (limit - start) // 2
+    for boundary in reversed(boundaries):
+        if floor < boundary <= limit:
+            return boundary
+    for separator in _SEPARATORS:
+        index = text.rfind(separator, floor, limit)
+        if index != -1:
+            return index + len(separator)
+    return limit
+
+
+def _spans(text: str, boundaries: list[int], max_chars: int, overlap: int) -> list[tuple[int, int]]:
+    spans = []
+    start = 0
+    while start < len(text):
+        limit = min(start + max_chars, len(text))
+        end = limit if limit == len(text) else _break_point(text, start, limit, boundaries)
+        spans.append((start, end))
+        if end == len(text):
+            break
+        next_start = max(end - overlap, start + 1)
+        space = text.find(" ", next_start, end)
+        start = space + 1 if overlap and space != -1 else next_start
+    return spans
+
+
+def split_text(text: str, max_chars: int, overlap: int = 0) -> list[str]:
+    """Split plain text into pieces of at most `max_chars`, preferring paragraph breaks."""
+    pieces = (text[start:end].strip() for start, end in _spans(text, [], max_chars, overlap))
+    return [piece for piece in pieces if piece]
+
+
+def chunk_document(doc: ParsedDocument, max_chars: int = 1200, overlap: int = 150) -> list[Chunk]:
+    """Split a parsed document into overlapping chunks that prefer segment boundaries."""
+    boundaries = sorted(end for _, end in doc.offsets)
+    chunks = []
+    for start, end in _spans(doc.text, boundaries, max_chars, overlap):
+        piece = doc.text[start:end].strip()
+        if piece:
+            chunks.append(Chunk(doc.sha256, piece, start, end))
+    return chunks
@@ -1,38 +1,159 @@
-from mrkdwn_analysis import MarkdownAnalyzer
-from pypdf import PdfReader
-from docx import Document
+import multiprocessing
+import os
+import signal
+import threading
+from collections.abc import Iterator
 
 from abc import ABC, abstractmethod
 
+from app.core.logger import logger
+from app.core.tracing import span
+
+# Parser backends (pypdf, python-docx, mrkdwn_analysis) are imported on first
+# use so that importing the app doesn't pay for every format up front.
+
 class Parser(ABC):
-    @abstractmethod
+    # Bump VERSION whenever a parser's output changes so cached extractions are invalidated.
+    VERSION: int = 1
+    SEGMENT: str = "document"
+
     @staticmethod
+    @abstractmethod
     def parse(file_path: str) -> str:
         raise NotImplementedError("This format isn't supported")
 
+    def parse_segments(self, file_path: str) -> list[str]:
+        """Extracted text split at the format's natural boundaries (`SEGMENT`)."""
+        return [self.parse(file_path)]
+
+
+class _PageTimeout(Exception):
+    pass
+
+
+def _raise_page_timeout(signum, frame):
+    raise _PageTimeout
+
+
+def _extract_page(page, timeout: float | None) -> str:
+    """Extract one page, giving up after `timeout` seconds where SIGALRM exists (main thread only)."""
+    if not timeout or not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        return page.extract_text() or ""
+
+    previous = signal.signal(signal.SIGALRM, _raise_page_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return page.extract_text() or ""
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_page_range(file_path: str, start: int, stop: int, page_timeout: float | None) -> list[str]:
+    """Process-pool worker: extract pages [start, stop), skipping bad or slow pages."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    return [_extract_page_safely(file_path, reader.pages[index], index, page_timeout) for index in range(start, stop)]
+
+
+def _extract_page_safely(file_path: str, page, index: int, page_timeout: float | None) -> str:
+    try:
+        return _extract_page(page, page_timeout)
+    except _PageTimeout:
+        logger.warning("{}: page {} timed out after {}s, skipped", file_path, index + 1, page_timeout)
+    except Exception as e:
+        logger.warning("{}: page {} could not be parsed ({}), skipped", file_path, index + 1, e)
+    return ""
+
 
 class PDFParser(Parser):
+    SEGMENT = "page"
+    # Seconds one page may take before it is skipped.
+    PAGE_TIMEOUT: float = 30.0
+
     @staticmethod
-    def parse(file_path: str):
+    def parse(file_path: str) -> str:
+        return "".join(PDFParser.iter_pages(file_path))
+
+    def parse_segments(self, file_path: str) -> list[str]:
+        # Ingestion already runs one file per pool worker, so pages are extracted serially
+        # there, with the same per-page timeout as the parallel path.
+        return list(self.iter_pages(file_path))
+
+    @staticmethod
+    def iter_pages(file_path: str, page_timeout: float | None = PAGE_TIMEOUT) -> Iterator[str]:
+        """Yield the text of each page without holding the whole document's text.
+
+        A page that fails or exceeds `page_timeout` yields an empty string.
+        """
+        from pypdf import PdfReader
+
         reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+        for index, page in enumerate(reader.pages):
+            yield _extract_page_safely(file_path, page, index, page_timeout)
+
+    @staticmethod
+    def parse_parallel(file_path: str, **kwargs) -> str:
+        return "".join(PDFParser.iter_pages_parallel(file_path, **kwargs))
+
+    @staticmethod
+    def iter_pages_parallel(
+        file_path: str,
+        max_workers: int | None = None,
+        pages_per_task: int = 16,
+        page_timeout: float | None = PAGE_TIMEOUT,
+    ) -> Iterator[str]:
+        """Yield page texts in order, extracting page ranges on a process pool.
+
+        A page that fails or exceeds `page_timeout` yields an empty string
+        instead of stalling the parse. The pool is owned by this call and
+        terminated when it ends, which also kills workers stuck in a range.
+        """
+        from pypdf import PdfReader
+
+        num_pages = len(PdfReader(file_path).pages)
+        ranges = [(start, min(start + pages_per_task, num_pages)) for start in range(0, num_pages, pages_per_task)]
+
+        pool = multiprocessing.get_context().Pool(processes=max_workers)
+        try:
+            results = [
+                pool.apply_async(_extract_page_range, (file_path, start, stop, page_timeout)) for start, stop in ranges
+            ]
+            for (start, stop), result in zip(ranges, results):
+                # Backstop for hangs SIGALRM can't interrupt (or platforms without it).
+                backstop = page_timeout * (stop - start) + 5 if page_timeout else None
+                try:
+                    yield from result.get(timeout=backstop)
+                except multiprocessing.TimeoutError:
+                    logger.warning("{}: pages {}-{} timed out, skipped", file_path, start + 1, stop)
+                    yield from [""] * (stop - start)
+        finally:
+            # Every result has been collected (or abandoned), so nothing useful is lost.
+            pool.terminate()
+            pool.join()
 
 class DocxParser(Parser):
+    SEGMENT = "paragraph"
+
     @staticmethod
     def parse(file_path: str) -> str:
+        from docx import Document
+
         doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text
-        return text
+        return "".join(paragraph.text for paragraph in doc.paragraphs)
+
+    def parse_segments(self, file_path: str) -> list[str]:
+        from docx import Document
+
+        return [paragraph.text for paragraph in Document(file_path).paragraphs]
 
 
 class MDParser(Parser):
     @staticmethod
     def parse(file_path: str) -> str:
+        from mrkdwn_analysis import MarkdownAnalyzer
+
         analyzer = MarkdownAnalyzer(file_path)
         text = analyzer.text
         return text
@@ -43,11 +164,20 @@ class TXTParser(Parser):
             text = f.read()
             return text
 
+PARSERS: dict[str, Parser] = {
+    "pdf": PDFParser(),
+    "docx": DocxParser(),
+    "md": MDParser(),
+    "txt": TXTParser()
+}
+
+
 def get_parser(file_extension: str) -> Parser:
-    parsers = {
-        "pdf": PDFParser(),
-        "docx": DocxParser(),
-        "md": MDParser(),
-        "txt": TXTParser()
-    }
-    return parsers.get(file_extension, Parser)
\ No newline at end of file
+    return PARSERS.get(file_extension.lower().lstrip("."), Parser)
+
+
+def parse_file(file_path: str) -> str:
+    """Parse a file with the parser registered for its extension."""
+    extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+    with span(f"parser.{extension if extension in PARSERS else 'other'}"):
+        return get_parser(extension).parse(file_path)
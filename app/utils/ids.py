@@ -0,0 +1,36 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_rand = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7): 48-bit Unix ms timestamp, then 74 random bits.
+
+    Keys generated later sort later, so primary key inserts append to the
+    right edge of the B-tree instead of splitting random pages. Within one
+    millisecond the random part is incremented, keeping keys monotonic per
+    process.
+    """
+    global _last_ms, _last_rand
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms <= _last_ms:
+            ms = _last_ms
+            rand = _last_rand + 1
+            if rand >> 74:
+                ms, rand = ms + 1, int.from_bytes(os.urandom(10), "big") >> 6
+        else:
+            rand = int.from_bytes(os.urandom(10), "big") >> 6
+        _last_ms, _last_rand = ms, rand
+
+    value = (ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= (rand >> 62) << 64  # rand_a, 12 bits
+    value |= 0b10 << 62  # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b, 62 bits
+    return uuid.UUID(int=value)
@@ -0,0 +1,127 @@
+import io
+import math
+from dataclasses import dataclass
+from xml.sax.saxutils import escape
+
+from app.utils.mind_map_tree import MindMapNode
+
+PALETTE = ["#A8D8EA", "#FFCFDF", "#FEFDCA", "#CBF1F5", "#E4C1F9", "#B5EAD7", "#FFDAC1", "#C7CEEA"]
+ROOT_COLOR = "#FFFFFF"
+LINE_COLOR = "#9AA5B1"
+TEXT_COLOR = "#2D3748"
+FONT_SIZE = 14
+CHAR_WIDTH = 0.6 * FONT_SIZE
+MAX_LABEL_CHARS = 32
+
+
+@dataclass
+class PlacedNode:
+    label: str
+    x: float
+    y: float
+    depth: int
+    color: str
+    parent: "PlacedNode | None"
+
+    @property
+    def width(self) -> float:
+        return len(self.label) * CHAR_WIDTH + 16
+
+    @property
+    def height(self) -> float:
+        return FONT_SIZE + 12
+
+
+def _leaves(node: MindMapNode) -> int:
+    return max(1, sum(_leaves(child) for child in node.children))
+
+
+def layout_radial(tree: MindMapNode, size: int = 1024) -> list[PlacedNode]:
+    """Radial tidy-tree layout.
+
+    Every node gets an angular sector proportional to its number of leaves
+    and sits on the ring for its depth, so the edges of different subtrees
+    never cross. Sectors ignore label width, so boxes of crowded neighbours
+    can still overlap. The ring spacing is chosen so every box, at its
+    widest, stays on the `size` x `size` canvas.
+    """
+    center = size / 2
+    ring = center
+    stack = [(tree, 0)]
+    while stack:
+        node, d = stack.pop()
+        if d:
+            half_extent = max(min(len(node.label), MAX_LABEL_CHARS) * CHAR_WIDTH + 16, FONT_SIZE + 12) / 2
+            ring = min(ring, (center - half_extent - 4) / d)
+        stack.extend((child, d + 1) for child in node.children)
+    placed: list[PlacedNode] = []
+
+    def place(node: MindMapNode, d: int, start: float, end: float, color: str, parent: PlacedNode | None) -> None:
+        angle = (start + end) / 2
+        radius = d * ring
+        label = node.label if len(node.label) <= MAX_LABEL_CHARS else node.label[:MAX_LABEL_CHARS - 1] + "…"
+        current = PlacedNode(label, center + radius * math.cos(angle), center + radius * math.sin(angle), d, color, parent)
+        placed.append(current)
+
+        total = _leaves(node)
+        cursor = start
+        for index, child in enumerate(node.children):
+            span = (end - start) * _leaves(child) / total
+            child_color = PALETTE[index % len(PALETTE)] if d == 0 else color
+            place(child, d + 1, cursor, cursor + span, child_color, current)
+            cursor += span
+
+    place(tree, 0, -math.pi / 2, 3 * math.pi / 2, ROOT_COLOR, None)
+    return placed
+
+
+def render_svg(tree: MindMapNode, size: int = 1024) -> str:
+    nodes = layout_radial(tree, size)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">',
+        f'<rect width="{size}" height="{size}" fill="#FFFFFF"/>',
+        f'<g stroke="{LINE_COLOR}" stroke-width="1.5" fill="none">',
+    ]
+    for node in nodes:
+        if node.parent is not None:
+            p = node.parent
+            parts.append(f'<line x1="{p.x:.1f}" y1="{p.y:.1f}" x2="{node.x:.1f}" y2="{node.y:.1f}"/>')
+    parts.append(f'</g><g font-family="Helvetica, Arial, sans-serif" font-size="{FONT_SIZE}" fill="{TEXT_COLOR}" text-anchor="middle">')
+    for node in nodes:
+        weight = ' font-weight="bold"' if node.depth <= 1 else ""
+        parts.append(
+            f'<rect x="{node.x - node.width / 2:.1f}" y="{node.y - node.height / 2:.1f}" '
+            f'width="{node.width:.1f}" height="{node.height:.1f}" rx="10" '
+            f'fill="{node.color}" stroke="{LINE_COLOR}"/>'
+            f'<text x="{node.x:.1f}" y="{node.y + FONT_SIZE / 3:.1f}"{weight}>{escape(node.label)}</text>'
+        )
+    parts.append("</g></svg>")
+    return "".join(parts)
+
+
+def render_png(tree: MindMapNode, size: int = 1024) -> bytes:
+    """Rasterize the same layout with Pillow (optional dependency)."""
+    try:
+        from PIL import Image, ImageDraw, ImageFont
+    except ImportError as e:
+        raise RuntimeError("PNG rendering requires Pillow; install it or request SVG output") from e
+
+    nodes = layout_radial(tree, size)
+    image = Image.new("RGB", (size, size), "white")
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.load_default(size=FONT_SIZE)
+    except TypeError:
+        font = ImageFont.load_default()
+
+    for node in nodes:
+        if node.parent is not None:
+            draw.line((node.parent.x, node.parent.y, node.x, node.y), fill=LINE_COLOR, width=2)
+    for node in nodes:
+        box = (node.x - node.width / 2, node.y - node.height / 2, node.x + node.width / 2, node.y + node.height / 2)
+        draw.rounded_rectangle(box, radius=10, fill=node.color, outline=LINE_COLOR)
+        draw.text((node.x, node.y), node.label, fill=TEXT_COLOR, font=font, anchor="mm")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=False)
+    return buffer.getvalue()
@@ -0,0 +1,269 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+_BULLET = re.compile(r"^(\s*)(?:[-*+]|\d+[.)])\s+(.*\S)\s*$")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*\S)\s*$")
+_KEY_NOISE = re.compile(r"[\W_]+")
+_NODE_ID = re.compile(r"^\[(n\d+)\]\s*(.*)$")
+DEFAULT_ROOT_LABEL = "Mind Map"
+
+
+@dataclass
+class MindMapNode:
+    label: str
+    children: list["MindMapNode"] = field(default_factory=list)
+    # Stable id within a MindMap ("n1", "n2", ...); empty for trees parsed from model output.
+    id: str = ""
+
+    @property
+    def key(self) -> str:
+        return node_key(self.label)
+
+    def size(self) -> int:
+        return 1 + sum(child.size() for child in self.children)
+
+
+def node_key(label: str) -> str:
+    """Label identity used for merging: case, punctuation and spacing are ignored."""
+    return _KEY_NOISE.sub(" ", label.casefold()).strip()
+
+
+def parse_markdown_tree(text: str) -> MindMapNode:
+    """Parse the nested Markdown list produced by the mind map prompt.
+
+    Bullet depth follows indentation; headings, if the model emits any, open
+    a level of their own. Several top-level items are wrapped in a synthetic root.
+    """
+    top = MindMapNode(DEFAULT_ROOT_LABEL)
+    # Depth is (heading level, bullet indent) compared lexicographically.
+    stack: list[tuple[tuple[int, int], MindMapNode]] = [((-1, -1), top)]
+    heading_depth = 0
+
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if heading := _HEADING.match(line):
+            level = len(heading.group(1)) - 1
+            depth, label = (level, -1), heading.group(2)
+            heading_depth = level + 1
+        elif bullet := _BULLET.match(line.expandtabs(4)):
+            depth, label = (heading_depth, len(bullet.group(1))), bullet.group(2)
+        else:
+            continue
+
+        label = label.strip().strip("*_`").strip()
+        while stack[-1][0] >= depth:
+            stack.pop()
+        node = MindMapNode(label)
+        stack[-1][1].children.append(node)
+        stack.append((depth, node))
+
+    if len(top.children) == 1:
+        return top.children[0]
+    return top
+
+
+def render_markdown(node: MindMapNode, indent: str = "  ") -> str:
+    lines = []
+
+    def walk(current: MindMapNode, depth: int) -> None:
+        lines.append(f"{indent * depth}- {current.label}")
+        for child in current.children:
+            walk(child, depth + 1)
+
+    walk(node, 0)
+    return "\n".join(lines)
+
+
+def _merge_into(target: MindMapNode, children: list[MindMapNode]) -> None:
+    by_key = {child.key: child for child in target.children}
+    for child in children:
+        existing = by_key.get(child.key)
+        if existing is None:
+            existing = MindMapNode(child.label)
+            target.children.append(existing)
+            by_key[child.key] = existing
+        _merge_into(existing, child.children)
+
+
+def merge_trees(trees: list[MindMapNode]) -> MindMapNode:
+    """Deterministically merge partial mind maps into one tree.
+
+    The root is the most common partial root (first seen wins ties). Branches
+    with the same label key are merged recursively in first-seen order;
+    partials rooted elsewhere become branches of the common root.
+    """
+    if not trees:
+        return MindMapNode(DEFAULT_ROOT_LABEL)
+    root_key = Counter(tree.key for tree in trees).most_common(1)[0][0]
+    root = MindMapNode(next(tree.label for tree in trees if tree.key == root_key))
+    for tree in trees:
+        _merge_into(root, tree.children if tree.key == root_key else [tree])
+    return root
+
+
+def _split_id(label: str) -> tuple[str | None, str]:
+    """`"[n3] Label"` -> `("n3", "Label")`; labels without an id -> `(None, label)`."""
+    if match := _NODE_ID.match(label):
+        return match.group(1), match.group(2).strip()
+    return None, label
+
+
+@dataclass
+class MindMapDiff:
+    """Structural changes between two versions of a MindMap.
+
+    `added` is in pre-order (parents before children) and `renamed` only
+    refers to nodes that existed before, so replaying `added` then
+    `renamed` on the old tree yields the new one.
+    """
+
+    added: list[dict] = field(default_factory=list)  # {"id", "parent", "label"}
+    renamed: list[dict] = field(default_factory=list)  # {"id", "label", "previous"}
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.renamed)
+
+    def node_ids(self) -> list[str]:
+        return [change["id"] for change in self.added] + [change["id"] for change in self.renamed]
+
+    def to_dict(self) -> dict:
+        return {"added": self.added, "renamed": self.renamed}
+
+
+class MindMap:
+    """A mind map tree whose nodes carry stable ids, so versions can be diffed and patched.
+
+    Ids are assigned in creation order and never reused. The model sees the
+    tree in the compact `- [n3] Label` form and answers with a delta in the
+    same form: existing nodes (by id) as anchors, optionally relabelled, and
+    new nodes without ids beneath them. Nodes are never moved or dropped.
+    """
+
+    def __init__(self, root: MindMapNode, next_id: int = 1):
+        self.root = root
+        self.next_id = next_id
+
+    @classmethod
+    def from_markdown(cls, text: str) -> "MindMap":
+        tree = cls(parse_markdown_tree(text))
+        for node in tree._walk():
+            node.id = tree._new_id()
+        return tree
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MindMap":
+        def build(item: dict) -> MindMapNode:
+            return MindMapNode(item["label"], [build(child) for child in item["children"]], item["id"])
+
+        return cls(build(data["root"]), data["next_id"])
+
+    def to_dict(self) -> dict:
+        def dump(node: MindMapNode) -> dict:
+            return {"id": node.id, "label": node.label, "children": [dump(child) for child in node.children]}
+
+        return {"next_id": self.next_id, "root": dump(self.root)}
+
+    def to_markdown(self) -> str:
+        return render_markdown(self.root)
+
+    def to_compact(self) -> str:
+        """One line per node with its id and a single-space indent per level, to keep prompts short."""
+        lines = []
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            lines.append(f"{' ' * depth}- [{node.id}] {node.label}")
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+        return "\n".join(lines)
+
+    def _walk(self):
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def _new_id(self) -> str:
+        node_id = f"n{self.next_id}"
+        self.next_id += 1
+        return node_id
+
+    def _parents(self) -> dict[str, MindMapNode | None]:
+        parents: dict[str, MindMapNode | None] = {self.root.id: None}
+        for node in self._walk():
+            for child in node.children:
+                parents[child.id] = node
+        return parents
+
+    def find(self, node_id: str) -> MindMapNode | None:
+        return next((node for node in self._walk() if node.id == node_id), None)
+
+    def branch_id(self, node_id: str) -> str:
+        """Id of the first-level branch containing `node_id` (the root's own id for the root)."""
+        parents = self._parents()
+        current = node_id
+        while (parent := parents.get(current)) is not None and parent is not self.root:
+            current = parent.id
+        return current
+
+    def apply_delta(self, delta: MindMapNode) -> MindMapDiff:
+        """Merge a delta tree parsed from model output in place and return what changed.
+
+        Anchors are matched by id, otherwise by label key among the parent's
+        children (as in `merge_trees`); unmatched nodes are added. Unknown ids
+        are treated as new nodes. An anchor whose label key differs is a
+        rename; case or punctuation changes alone are ignored.
+        """
+        nodes = {node.id: node for node in self._walk()}
+        diff = MindMapDiff()
+        added: dict[str, dict] = {}
+
+        def visit(item: MindMapNode, parent: MindMapNode) -> None:
+            node_id, label = _split_id(item.label)
+            target = nodes.get(node_id)
+            if target is None and label:
+                target = next((child for child in parent.children if child.key == node_key(label)), None)
+            if target is None:
+                if not label:
+                    return
+                target = MindMapNode(label, id=self._new_id())
+                parent.children.append(target)
+                nodes[target.id] = target
+                added[target.id] = {"id": target.id, "parent": parent.id, "label": label}
+                diff.added.append(added[target.id])
+            elif label and node_key(label) != target.key:
+                if target.id in added:
+                    added[target.id]["label"] = label
+                else:
+                    diff.renamed.append({"id": target.id, "label": label, "previous": target.label})
+                target.label = label
+            for child in item.children:
+                visit(child, target)
+
+        node_id, label = _split_id(delta.label)
+        if node_id is None and (delta.label == DEFAULT_ROOT_LABEL or node_key(label) == self.root.key):
+            # Several top-level anchors were wrapped in a synthetic root, or the root was repeated without its id.
+            for child in delta.children:
+                visit(child, self.root)
+        elif node_id == self.root.id:
+            if label and node_key(label) != self.root.key:
+                diff.renamed.append({"id": self.root.id, "label": label, "previous": self.root.label})
+                self.root.label = label
+            for child in delta.children:
+                visit(child, self.root)
+        else:
+            visit(delta, self.root)
+        return diff
+
+    def apply_diff(self, diff: dict) -> None:
+        """Replay a stored `MindMapDiff.to_dict()`, e.g. to rebuild a later version from an earlier one."""
+        nodes = {node.id: node for node in self._walk()}
+        for change in diff["added"]:
+            node = MindMapNode(change["label"], id=change["id"])
+            nodes[change["parent"]].children.append(node)
+            nodes[node.id] = node
+            self.next_id = max(self.next_id, int(node.id[1:]) + 1)
+        for change in diff["renamed"]:
+            nodes[change["id"]].label = change["label"]
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from itertools import accumulate
+
+from app.utils.file_parser import PARSERS, Parser, get_parser
+
+HASH_CHUNK_SIZE = 1024 * 1024
+_SHA256 = re.compile(r"[0-9a-f]{64}")
+_ENTRY = re.compile(r"(?P<sha256>[0-9a-f]{64})\.(?P<parser>\w+)\.json")
+
+
+@dataclass
+class ParsedDocument:
+    sha256: str
+    parser: str
+    parser_version: int
+    segment: str
+    text: str
+    # (start, end) character offsets of each page/paragraph within `text`.
+    offsets: list[tuple[int, int]]
+
+    def segments(self) -> list[str]:
+        return [self.text[start:end] for start, end in self.offsets]
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedDocumentCache:
+    """Extracted text persisted once per file content hash and parser.
+
+    The same bytes parse differently by extension (e.g. .md vs .txt), so
+    entries are stored as `<sha256>.<parser>.json` and every lookup names
+    the parser. An entry written by an older parser version is treated as a
+    miss and replaced.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, sha256: str, parser: str) -> str:
+        return os.path.join(self.directory, sha256[:2], f"{sha256}.{parser}.json")
+
+    @staticmethod
+    def _is_current(doc: ParsedDocument) -> bool:
+        parser = PARSERS.get(doc.parser)
+        return parser is not None and parser.VERSION == doc.parser_version
+
+    def get(self, sha256: str, parser: str) -> ParsedDocument | None:
+        if not _SHA256.fullmatch(sha256) or parser not in PARSERS:
+            return None
+        try:
+            with open(self._path(sha256, parser), encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        doc = ParsedDocument(**{**data, "offsets": [tuple(o) for o in data["offsets"]]})
+        return doc if self._is_current(doc) else None
+
+    def parsers(self, sha256: str) -> list[str]:
+        """Parsers with a current entry for a content hash."""
+        return [parser for parser in PARSERS if self.get(sha256, parser) is not None]
+
+    def put(self, doc: ParsedDocument) -> None:
+        path = self._path(doc.sha256, doc.parser)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(doc), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, file_path: str) -> tuple[ParsedDocument, bool]:
+        """Return the parsed document for a file and whether it came from the cache."""
+        sha256 = file_sha256(file_path)
+        extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+        doc = self.get(sha256, extension)
+        if doc is not None:
+            return doc, True
+
+        parser = get_parser(extension)
+        if parser is Parser:
+            raise NotImplementedError("This format isn't supported")
+
+        segments = parser.parse_segments(file_path)
+        ends = list(accumulate(len(segment) for segment in segments))
+        doc = ParsedDocument(
+            sha256=sha256,
+            parser=extension,
+            parser_version=parser.VERSION,
+            segment=parser.SEGMENT,
+            text="".join(segments),
+            offsets=list(zip([0, *ends[:-1]], ends)),
+        )
+        self.put(doc)
+        return doc, False
+
+    def purge_stale(self) -> int:
+        """Delete entries produced by parser versions that are no longer current (and pre-parser-key entries)."""
+        removed = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                entry = _ENTRY.fullmatch(name)
+                if entry is None or self.get(entry["sha256"], entry["parser"]) is None:
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+        return removed
+
+
+if __name__ == "__main__":
+    from app.core.config import settings
+
+    cache = ParsedDocumentCache(settings.materials.MATERIALS_PARSED_CACHE_DIR)
+    print(f"Removed {cache.purge_stale()} stale parsed documents")
@@ -0,0 +1,64 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call(Generic[T]):
+    task: asyncio.Task[T]
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one upstream call.
+
+    Every caller awaiting a key gets the result (or exception) of the single
+    in-flight call. Results are not retained once the call finishes, so a
+    failure is never served to later callers. A caller that is cancelled only
+    detaches itself; the shared call is cancelled when its last waiter leaves.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[str, _Call] = {}
+        self.stats = {"calls": 0, "upstream_calls": 0, "coalesced": 0, "failures": 0, "cancelled": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self.stats["calls"] += 1
+        call = self._calls.get(key)
+        if call is None:
+            self.stats["upstream_calls"] += 1
+            call = _Call(asyncio.create_task(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._finish(key, task))
+        else:
+            self.stats["coalesced"] += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                # Detach the key first so a new caller starts a fresh call
+                # instead of joining the one being cancelled.
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        call = self._calls.get(key)
+        if call is not None and call.task is task:
+            del self._calls[key]
+        if task.cancelled():
+            self.stats["cancelled"] += 1
+        elif task.exception() is not None:
+            self.stats["failures"] += 1
+
+    def snapshot(self) -> dict[str, int]:
+        return {**self.stats, "in_flight": len(self._calls), "upstream_calls_saved": self.stats["coalesced"]}
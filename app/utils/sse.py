@@ -0,0 +1,63 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from starlette.requests import Request
+
+HEARTBEAT = ": heartbeat\n\n"
+_DONE = object()
+
+
+def sse_event(data: Any, event: str | None = None) -> str:
+    """Format one server-sent event frame with a JSON payload."""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_with_heartbeat(
+    request: Request,
+    frames: AsyncIterator[str],
+    heartbeat: float = 15.0,
+    buffer: int = 64,
+) -> AsyncIterator[str]:
+    """Relay SSE frames through a bounded buffer with heartbeats and disconnect handling.
+
+    The producer pulls from `frames` only while the buffer has room, so a slow
+    client slows the upstream read instead of growing memory. Heartbeat
+    comments keep proxies from closing idle connections. The client is
+    checked between frames, and once it goes away the producer is cancelled
+    and `frames` closed, so the upstream stream is released right away.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+
+    async def produce() -> None:
+        try:
+            async for frame in frames:
+                await queue.put(frame)
+        except asyncio.CancelledError:
+            # The consumer is gone and may have left the queue full; signalling would block forever.
+            raise
+        except Exception as e:
+            await queue.put(sse_event({"detail": str(e) or type(e).__name__}, event="error"))
+        await queue.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield HEARTBEAT
+                continue
+            if frame is _DONE or await request.is_disconnected():
+                break
+            yield frame
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        aclose = getattr(frames, "aclose", None)
+        if aclose is not None:
+            await aclose()
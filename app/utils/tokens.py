@@ -0,0 +1,8 @@
+import math
+
+# Rough average for English prose with OpenAI tokenizers; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
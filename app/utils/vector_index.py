@@ -0,0 +1,245 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+VECTORS_FILE = "vectors.f32"
+ROWS_FILE = "rows.jsonl"
+LOCK_FILE = "index.lock"
+
+
+class VectorIndex:
+    """Append-only, memory-mapped cosine-similarity index over chunk vectors.
+
+    Vectors live in a raw float32 file that is memory-mapped for search;
+    row metadata and per-material deletions are an append-only JSONL log.
+    Deleted rows are masked out until `compact()` rewrites both files.
+    Below `ivf_threshold` rows search is exact; above it an IVF (k-means
+    inverted lists) index probes the `nprobe` nearest clusters.
+
+    Several processes may share a directory: writes hold an exclusive file
+    lock and reads a shared one, and a process reloads its in-memory view
+    when it sees the row log changed under it.
+    """
+
+    def __init__(self, directory: str, dim: int, ivf_threshold: int = 20000, nprobe: int = 8):
+        self.directory = directory
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+
+        self._rows: list[dict] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._material_rows: dict[str, list[int]] = {}
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+
+        self._centroids: np.ndarray | None = None
+        self._lists: list[np.ndarray] = []
+        self._trained_rows = 0
+        # (inode, size) of the row log this view was loaded from.
+        self._log_state: tuple[int, int] | None = None
+
+        os.makedirs(directory, exist_ok=True)
+        with self._file_lock(exclusive=False):
+            self._load()
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    def __contains__(self, material_id: str) -> bool:
+        return material_id in self._material_rows
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        with open(self._path(LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _stat_log(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self._path(ROWS_FILE))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def _sync(self) -> None:
+        """Reload if another process appended to or compacted the index."""
+        if self._stat_log() != self._log_state:
+            self._load()
+
+    def _load(self) -> None:
+        self._rows = []
+        self._material_rows = {}
+        self._log_state = self._stat_log()
+        alive = []
+        if os.path.exists(self._path(ROWS_FILE)):
+            with open(self._path(ROWS_FILE), encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if "delete" in record:
+                        for row in self._material_rows.pop(record["delete"], []):
+                            alive[row] = False
+                        continue
+                    self._material_rows.setdefault(record["material_id"], []).append(len(self._rows))
+                    self._rows.append(record)
+                    alive.append(True)
+
+        # Vectors are written before their rows, so only a torn write leaves
+        # rows without vectors; those rows are dropped.
+        try:
+            stored = os.path.getsize(self._path(VECTORS_FILE)) // (4 * self.dim)
+        except FileNotFoundError:
+            stored = 0
+        if stored < len(self._rows):
+            for row in self._rows[stored:]:
+                rows = self._material_rows.get(row["material_id"], [])
+                rows[:] = [i for i in rows if i < stored]
+                if not rows:
+                    self._material_rows.pop(row["material_id"], None)
+            del self._rows[stored:], alive[stored:]
+        self._alive = np.array(alive, dtype=bool)
+        self._remap()
+
+    def _remap(self) -> None:
+        if self._rows:
+            self._vectors = np.memmap(
+                self._path(VECTORS_FILE), dtype=np.float32, mode="r", shape=(len(self._rows), self.dim)
+            )
+        else:
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._centroids = None
+
+    def _append_log(self, records: list[dict]) -> None:
+        with open(self._path(ROWS_FILE), "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+    def add(self, material_id: str, chunks: list[dict], vectors: np.ndarray) -> None:
+        """Add (or replace) the chunks of one material."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(chunks), self.dim):
+            raise ValueError(f"Expected vectors of shape ({len(chunks)}, {self.dim}), got {vectors.shape}")
+
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            self._delete_locked(material_id)
+            records = [{**chunk, "material_id": material_id} for chunk in chunks]
+            with open(self._path(VECTORS_FILE), "ab") as f:
+                # Drop vectors left by a write whose rows never made it to the log.
+                f.truncate(len(self._rows) * self.dim * 4)
+                f.write(vectors.tobytes())
+            self._append_log(records)
+            self._log_state = self._stat_log()
+
+            first = len(self._rows)
+            self._rows.extend(records)
+            self._material_rows[material_id] = list(range(first, len(self._rows)))
+            self._alive = np.concatenate([self._alive, np.ones(len(records), dtype=bool)])
+
+            centroids, lists, trained_rows = self._centroids, self._lists, self._trained_rows
+            self._remap()
+            # Keep the IVF lists current for new rows until the index doubles.
+            if centroids is not None and len(self._rows) < 2 * trained_rows:
+                self._centroids, self._lists, self._trained_rows = centroids, lists, trained_rows
+                assignment = np.argmax(vectors @ centroids.T, axis=1)
+                for cluster in np.unique(assignment):
+                    new_rows = first + np.flatnonzero(assignment == cluster)
+                    self._lists[cluster] = np.concatenate([self._lists[cluster], new_rows])
+
+    def delete(self, material_id: str) -> int:
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            removed = self._delete_locked(material_id)
+            self._log_state = self._stat_log()
+            return removed
+
+    def _delete_locked(self, material_id: str) -> int:
+        rows = self._material_rows.pop(material_id, [])
+        if rows:
+            self._alive[rows] = False
+            self._append_log([{"delete": material_id}])
+        return len(rows)
+
+    def compact(self) -> None:
+        """Rewrite storage without deleted rows."""
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            keep = np.flatnonzero(self._alive)
+            vectors = np.array(self._vectors[keep])
+            rows = [self._rows[i] for i in keep]
+
+            tmp = self._path(VECTORS_FILE + ".tmp")
+            with open(tmp, "wb") as f:
+                f.write(vectors.tobytes())
+            os.replace(tmp, self._path(VECTORS_FILE))
+            tmp = self._path(ROWS_FILE + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+            os.replace(tmp, self._path(ROWS_FILE))
+
+            self._rows = rows
+            self._alive = np.ones(len(rows), dtype=bool)
+            self._material_rows = {}
+            for i, row in enumerate(rows):
+                self._material_rows.setdefault(row["material_id"], []).append(i)
+            self._log_state = self._stat_log()
+            self._remap()
+
+    def _train_ivf(self, iterations: int = 10, sample_size: int = 50000) -> None:
+        n = len(self._rows)
+        nlist = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(0)
+        sample = np.asarray(self._vectors[rng.choice(n, size=min(n, sample_size), replace=False)])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = sample[assignment == cluster]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[cluster] = centroid / max(np.linalg.norm(centroid), 1e-12)
+
+        assignment = np.empty(n, dtype=np.int64)
+        for start in range(0, n, 65536):
+            assignment[start:start + 65536] = np.argmax(self._vectors[start:start + 65536] @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+        self._centroids = centroids
+        self._trained_rows = n
+
+    def search(self, query: np.ndarray, k: int = 5, exact: bool | None = None) -> list[tuple[float, dict]]:
+        """Top-k (score, row) pairs by cosine similarity for a normalized query vector."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        with self._lock, self._file_lock(exclusive=False):
+            self._sync()
+            if not len(self._rows):
+                return []
+            if exact is None:
+                exact = len(self._rows) < self.ivf_threshold
+
+            if exact:
+                candidates = np.flatnonzero(self._alive)
+                scores = (self._vectors @ query)[candidates]
+            else:
+                if self._centroids is None:
+                    self._train_ivf()
+                probes = np.argsort(self._centroids @ query)[-self.nprobe:]
+                candidates = np.sort(np.concatenate([self._lists[c] for c in probes]))
+                candidates = candidates[self._alive[candidates]]
+                scores = self._vectors[candidates] @ query
+
+            if not len(candidates):
+                return []
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[i]), self._rows[candidates[i]]) for i in top]
@@ -0,0 +1,155 @@
+"""Insert throughput and index size for random (uuid4) vs time-ordered (uuid7) primary keys.
+
+Runs against the PostgreSQL database from the DB_* settings, e.g. a local
+
+    docker run --rm -p 5432:5432 -e POSTGRES_USER=bench -e POSTGRES_PASSWORD=bench \\
+        -e POSTGRES_DB=bench postgres:16
+    DB_USER=bench DB_PASSWORD=bench DB_NAME=bench python -m benchmarks.db_insert --rows 200000
+
+If PostgreSQL is unreachable (or with --sqlite) it falls back to a SQLite
+stand-in. SQLite also keeps a UUID primary key in a B-tree, so the page-split
+effect of random keys shows up in its index size, but absolute numbers and
+GIN/upsert timings are PostgreSQL-only.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import JSON, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, BaseId, jsonb_gin_index
+
+PAYLOAD = postgresql.JSONB().with_variant(JSON(), "sqlite")
+
+
+class _TurnColumns:
+    session_id: Mapped[UUID]
+    seq: Mapped[int]
+    payload: Mapped[dict[str, Any]] = mapped_column(PAYLOAD)
+
+
+class RandomKeyTurn(_TurnColumns, Base):
+    __tablename__ = "bench_turns_uuid4"
+    __table_args__ = (jsonb_gin_index("ix_bench_turns_uuid4_payload", "payload"),)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+
+
+class OrderedKeyTurn(_TurnColumns, BaseId):
+    __tablename__ = "bench_turns_uuid7"
+    __table_args__ = (jsonb_gin_index("ix_bench_turns_uuid7_payload", "payload"),)
+
+
+MODELS = {"uuid4": RandomKeyTurn, "uuid7": OrderedKeyTurn}
+TABLES = [model.__table__ for model in MODELS.values()]
+
+
+def _rows(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    sessions = [uuid4() for _ in range(max(1, count // 50))]
+    return [
+        {
+            "session_id": rng.choice(sessions),
+            "seq": i,
+            "payload": {"role": rng.choice(("user", "assistant")), "tokens": rng.randint(5, 800), "topic": f"t{rng.randint(0, 99)}"},
+        }
+        for i in range(count)
+    ]
+
+
+async def _sizes(engine: AsyncEngine, table: str) -> dict[str, int]:
+    async with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            result = await conn.execute(text(
+                "SELECT pg_relation_size(:table), pg_relation_size(:pkey), "
+                "pg_relation_size(:gin), pg_total_relation_size(:table)"
+            ), {"table": table, "pkey": f"{table}_pkey", "gin": f"ix_{table}_payload"})
+            heap, pkey, gin, total = result.one()
+            return {"table_bytes": heap, "pkey_bytes": pkey, "gin_bytes": gin, "total_bytes": total}
+        result = await conn.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+        sizes = dict(result.all())
+        return {"table_bytes": sizes.get(table, 0), "pkey_bytes": sizes.get(f"sqlite_autoindex_{table}_1", 0)}
+
+
+async def run(engine: AsyncEngine, count: int, batch_size: int) -> dict:
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all, tables=TABLES)
+        await conn.run_sync(Base.metadata.create_all, tables=TABLES)
+
+    rows = _rows(count)
+    results = {}
+    for name, model in MODELS.items():
+        start = time.perf_counter()
+        async with sessionmaker() as db:
+            for offset in range(0, count, batch_size):
+                # One transaction per batch, like a steady stream of writers.
+                await model.bulk_insert(db, [dict(row) for row in rows[offset:offset + batch_size]], batch_size)
+                await db.commit()
+        elapsed = time.perf_counter() - start
+        result = {"rows": count, "seconds": elapsed, "rows_per_second": count / elapsed}
+
+        if engine.dialect.name == "postgresql":
+            async with sessionmaker() as db:
+                ids = (await db.execute(text(f"SELECT id FROM {model.__tablename__} LIMIT :n"), {"n": count // 10})).scalars()
+                updates = [{"id": row_id, "session_id": uuid4(), "seq": -1, "payload": {"updated": True}} for row_id in ids]
+                start = time.perf_counter()
+                await model.bulk_upsert(db, updates, index_elements=["id"], batch_size=batch_size)
+                await db.commit()
+                result["upsert_rows_per_second"] = len(updates) / (time.perf_counter() - start)
+            async with engine.connect() as conn:
+                await conn.execute(text(f"ANALYZE {model.__tablename__}"))
+
+        result.update(await _sizes(engine, model.__tablename__))
+        results[name] = result
+    return results
+
+
+async def main_async(args) -> None:
+    engine = None
+    if not args.sqlite:
+        from app.core.config import settings
+
+        engine = create_async_engine(settings.db.url)
+        try:
+            async with engine.connect():
+                pass
+        except Exception as e:
+            print(f"PostgreSQL unavailable ({type(e).__name__}: {e}); using the SQLite stand-in", file=sys.stderr)
+            await engine.dispose()
+            engine = None
+    if engine is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="bench_db_"), "bench.sqlite3")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    try:
+        results = await run(engine, args.rows, args.batch)
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all, tables=TABLES)
+    finally:
+        await engine.dispose()
+    print(json.dumps({"backend": engine.dialect.name, **results}, indent=2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--sqlite", action="store_true", help="use the SQLite stand-in")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark tables")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Shared setup and measurement helpers for the benchmarks."""
+import json
+import math
+import os
+import resource
+import tempfile
+
+STUB_PORT = 8765
+
+
+def configure_environment(stub_port: int = STUB_PORT) -> None:
+    """Point the app at the local stub with caches off and scratch directories.
+
+    Must run before `app` is imported, since settings are read at import time.
+    Explicitly set environment variables win.
+    """
+    scratch = tempfile.mkdtemp(prefix="bench_")
+    os.environ.setdefault("OPENAI_BASE_URL", f"http://127.0.0.1:{stub_port}/v1")
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("CACHE_ENABLED", "false")
+    os.environ.setdefault("MIND_MAP_OUTPUT_DIR", os.path.join(scratch, "mind_maps"))
+    os.environ.setdefault("JOBS_DB_PATH", os.path.join(scratch, "jobs.sqlite3"))
+    os.environ.setdefault("RETRIEVAL_INDEX_DIR", os.path.join(scratch, "index"))
+    # Measure the app rather than the client-side rate limiter.
+    os.environ.setdefault("UPSTREAM_LIMITS", json.dumps({
+        model: {"rpm": 1_000_000, "tpm": 1_000_000_000}
+        for model in ("gpt-4.1-mini", "gpt-image-1", "text-embedding-3-small")
+    }))
+    for var in ("DB_USER", "DB_PASSWORD", "DB_NAME"):
+        os.environ.setdefault(var, "bench")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, `q` in [0, 100]."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def latency_summary(latencies: list[float]) -> dict:
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=float("nan")),
+    }
+
+
+def rss_mib() -> float:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return peak_rss_mib()
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if os.uname().sysname == "Darwin" else peak / 2**10
@@ -0,0 +1,54 @@
+"""Concurrent load benchmark for ``POST /api/mindmap/generate``.
+
+Drives the app in-process against the local OpenAI stub. With the async
+pipeline, N concurrent requests should take roughly as long as one.
+
+    python -m benchmarks.mind_map_load --concurrency 32
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.harness import STUB_PORT, configure_environment
+
+
+async def run(concurrency: int) -> None:
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one(i: int) -> float:
+            start = time.perf_counter()
+            response = await client.post("/api/mindmap/generate", json={"material": f"Lecture notes #{i}"})
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        single = await one(0)
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one(i) for i in range(concurrency)))
+        total = time.perf_counter() - start
+
+    print(f"single request:        {single:.3f}s")
+    print(f"{concurrency} concurrent requests: {total:.3f}s (max {max(latencies):.3f}s)")
+    print(f"ratio concurrent/single: {total / single:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    configure_environment()
+
+    from benchmarks.stub_openai import serve_in_thread
+
+    server = serve_in_thread(STUB_PORT)
+    try:
+        asyncio.run(run(args.concurrency))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Prompt-prefix check: consecutive calls of each flow must share byte-identical prefixes.
+
+Runs the text flows against the local OpenAI stub with request recording on
+and checks, per flow, that:
+
+* every call carries the same `prompt_cache_key` (the prompt id),
+* single-shot flows (mind map, homework, lesson) send an identical static
+  prompt, and the mind map update also an identical tree context, before the
+  material that differs between calls,
+* a multi-turn chat sends each earlier request's messages unchanged at the
+  start of the next one.
+
+It also reports the `cached_tokens` the stub returned (it simulates OpenAI's
+prefix cache) as counted by the app's `openai_tokens_total{kind="cached_prompt"}`
+metric, and the static prefix size against the provider's 1024-token minimum.
+Exits non-zero if a check fails. Run it from the repository root as a
+module, so `app` and `benchmarks` are importable (running the file directly
+fails with ModuleNotFoundError):
+
+    python -m benchmarks.prompt_prefix
+"""
+import asyncio
+import json
+import sys
+
+from benchmarks.harness import STUB_PORT, configure_environment
+
+MATERIALS = [
+    "Lecture notes: photosynthesis converts light energy into chemical energy in chloroplasts.",
+    "Lecture notes: cellular respiration releases energy from glucose in mitochondria.",
+    "Lecture notes: transpiration moves water from roots to leaves through the xylem.",
+]
+
+
+def _serialized(messages: list[dict]) -> str:
+    return json.dumps(messages, ensure_ascii=False, separators=(",", ":"))
+
+
+def _leading_identical(requests: list[list[dict]]) -> int:
+    """How many leading messages every request has in common."""
+    count = 0
+    while all(len(messages) > count for messages in requests) and all(
+        messages[count] == requests[0][count] for messages in requests
+    ):
+        count += 1
+    return count
+
+
+async def _chat_turns(replies: int) -> None:
+    from app.dto.chat import ChatMessage, ChatRequest
+    from app.services.chat_service import stream_chat
+
+    history: list[ChatMessage] = []
+    for i in range(replies):
+        history.append(ChatMessage(role="user", content=f"Question {i}: why do leaves change colour?"))
+        reply = ""
+        async for frame in stream_chat(ChatRequest(messages=history, mode="socratic")):
+            if frame.startswith("event: token"):
+                reply += json.loads(frame.split("data: ", 1)[1])["delta"]
+        history.append(ChatMessage(role="assistant", content=reply))
+
+
+async def _run_flows() -> dict[str, int]:
+    """Run every flow; returns how many stub requests each one made, in order."""
+    from app.services.homework_service import generate_homework
+    from app.services.lesson_service import generate_lesson
+    from app.services.mind_map_service import generate_mind_map_text
+    from app.services.mind_map_version_service import _request_mind_map_delta
+    from app.utils.mind_map_tree import MindMap
+    from benchmarks.stub_openai import stub_config
+
+    tree = MindMap.from_markdown("- Plant biology\n  - Photosynthesis\n    - Chloroplasts\n  - Respiration")
+    flows = {
+        "mind_map": lambda material: generate_mind_map_text(material),
+        "mind_map_update": lambda material: _request_mind_map_delta(tree, material),
+        "homework": generate_homework,
+        "lesson": generate_lesson,
+    }
+    counts = {}
+    for name, flow in flows.items():
+        before = len(stub_config.requests)
+        for material in MATERIALS:
+            await flow(material)
+        counts[name] = len(stub_config.requests) - before
+    before = len(stub_config.requests)
+    await _chat_turns(len(MATERIALS))
+    counts["chat"] = len(stub_config.requests) - before
+    return counts
+
+
+def _cached_tokens() -> float:
+    from prometheus_client import REGISTRY
+
+    return sum(
+        sample.value
+        for metric in REGISTRY.collect()
+        if metric.name == "openai_tokens"
+        for sample in metric.samples
+        if sample.name == "openai_tokens_total" and sample.labels.get("kind") == "cached_prompt"
+    )
+
+
+def check() -> tuple[dict, list[str]]:
+    from benchmarks.stub_openai import serve_in_thread, stub_config
+
+    stub_config.latency = stub_config.jitter = 0
+    stub_config.token_delay = 0
+    stub_config.record = True
+    stub = serve_in_thread(STUB_PORT)
+    try:
+        from app.prompts.assembly import PROMPTS
+
+        cached_before = _cached_tokens()
+        counts = asyncio.run(_run_flows())
+        cached = _cached_tokens() - cached_before
+    finally:
+        stub.should_exit = True
+
+    chats = [request["body"] for request in stub_config.requests if request["path"].endswith("/chat/completions")]
+    failures = []
+    results = {"cached_prompt_tokens": cached, "flows": {}}
+    offset = 0
+    for name, count in counts.items():
+        bodies, offset = chats[offset:offset + count], offset + count
+        requests = [body["messages"] for body in bodies]
+        keys = {body.get("prompt_cache_key") for body in bodies}
+        leading = _leading_identical(requests)
+        # 4 characters per token, as in the stub.
+        static_tokens = len(_serialized(requests[0][:leading])) // 4
+        prompt = PROMPTS.get(next(iter(keys), "").split("@")[0])
+        results["flows"][name] = {
+            "requests": count,
+            "prompt_cache_key": sorted(map(str, keys)),
+            "identical_leading_messages": leading,
+            "shared_prefix_tokens": static_tokens,
+            "prompt_tokens": prompt and len(prompt.text) // 4,
+            "below_provider_minimum": static_tokens < 1024,
+        }
+        if len(keys) != 1 or None in keys:
+            failures.append(f"{name}: prompt_cache_key differs or is missing: {keys}")
+        if name == "chat":
+            for earlier, later in zip(requests, requests[1:]):
+                if _serialized(later[:len(earlier)]) != _serialized(earlier):
+                    failures.append("chat: a later request does not start with the earlier request's messages")
+        else:
+            expected = 2 if name == "mind_map_update" else 1
+            if leading < expected:
+                failures.append(f"{name}: only {leading} identical leading messages, expected {expected}")
+    return results, failures
+
+
+def main() -> None:
+    configure_environment()
+    results, failures = check()
+    print(json.dumps(results, indent=2))
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Serialization time and bytes on the wire for MindMapRead responses.
+
+Compares the JSON encoders a response can go through — FastAPI's classic
+`jsonable_encoder` + `json.dumps` (JSONResponse), pydantic-core's
+`model_dump_json` (the path for routes with a `response_model`) and orjson
+(FastJSONResponse, for routes returning dicts) — and the size and time of
+each Content-Encoding the compression middleware can pick.
+
+    python -m benchmarks.serialization --nodes 50 500 5000
+"""
+import argparse
+import gzip
+import json
+import statistics
+import time
+from collections.abc import Callable
+
+from benchmarks.synthetic_docs import mind_map_markdown
+
+ENCODINGS = {
+    "gzip-1": ("gzip", 1),
+    "gzip-6": ("gzip", 6),
+    "br-4": ("br", 4),
+    "br-11": ("br", 11),
+}
+
+
+def _median_seconds(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        import brotli
+
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level)
+
+
+def payload(nodes: int):
+    from app.dto.content import MindMapRead
+
+    return MindMapRead(
+        mind_map_text=mind_map_markdown(nodes),
+        image_path="static/mind_maps/3f9a2c.png",
+        image_url="/api/mindmap/images/3f9a2c.png",
+    )
+
+
+def measure_payload(nodes: int, repeat: int) -> dict:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.api.responses import FastJSONResponse
+
+    model = payload(nodes)
+    serializers = {
+        "json_response": lambda: JSONResponse(jsonable_encoder(model)).body,
+        "model_dump_json": lambda: model.model_dump_json().encode(),
+        "fast_json_response": lambda: FastJSONResponse(model.model_dump()).body,
+    }
+    body = serializers["model_dump_json"]()
+    result = {"nodes": nodes, "serializers": {}, "encodings": {"identity": {"bytes": len(body)}}}
+    for name, serialize in serializers.items():
+        # All encoders must produce the same document.
+        assert json.loads(serialize()) == json.loads(body), name
+        result["serializers"][name] = {"seconds": _median_seconds(serialize, repeat), "bytes": len(serialize())}
+    for name, (encoding, level) in ENCODINGS.items():
+        compressed = _compress(body, encoding, level)
+        result["encodings"][name] = {
+            "bytes": len(compressed),
+            "ratio": len(body) / len(compressed),
+            "seconds": _median_seconds(lambda: _compress(body, encoding, level), repeat),
+        }
+    return result
+
+
+def measure(sizes: list[int], repeat: int) -> dict:
+    return {f"nodes_{nodes}": measure_payload(nodes, repeat) for nodes in sizes}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="*", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(measure(args.nodes, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Cold-start benchmark: time to import the app and to finish startup, in fresh interpreters.
+
+Reports the median wall time of `import app.main` and of a full boot (import
+plus lifespan startup), and an import-time breakdown by top-level package
+from `python -X importtime`.
+
+    python -m benchmarks.startup --repeat 5 --budget 1.5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.harness import configure_environment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT = """
+import asyncio
+from app.main import app
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(boot())
+"""
+
+
+def _run(code: str, *flags: str) -> tuple[float, str]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))}
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, *flags, "-c", code], env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return time.perf_counter() - start, completed.stderr
+
+
+def import_breakdown(stderr: str, top: int = 15) -> dict:
+    """Self time per top-level package and the app's own cumulative import time, in ms."""
+    packages: dict[str, int] = defaultdict(int)
+    app_total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        if not self_us.isdigit():
+            continue  # header row
+        packages[name.split(".")[0]] += int(self_us)
+        if name == "app.main":
+            app_total = int(cumulative_us)
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {"app_main_ms": app_total / 1000, "packages_ms": {name: us / 1000 for name, us in ranked}}
+
+
+def measure(repeat: int) -> dict:
+    imports, boots = [], []
+    for _ in range(repeat):
+        imports.append(_run("import app.main")[0])
+        boots.append(_run(BOOT)[0])
+    _, importtime = _run("import app.main", "-X", "importtime")
+    baseline = statistics.median(_run("pass")[0] for _ in range(repeat))
+    return {
+        "interpreter_seconds": baseline,
+        "import_seconds": statistics.median(imports),
+        # Tracked for regressions by the suite.
+        "seconds": statistics.median(boots),
+        "imports": import_breakdown(importtime),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, help="fail if the median boot takes longer (seconds)")
+    args = parser.parse_args()
+
+    configure_environment()
+    result = measure(args.repeat)
+    print(json.dumps(result, indent=2))
+    if args.budget is not None and result["seconds"] > args.budget:
+        print(f"boot {result['seconds']:.3f}s exceeds the {args.budget:.3f}s budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
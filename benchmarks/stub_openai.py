@@ -0,0 +1,171 @@
+"""Local OpenAI-compatible stub server for benchmarks.
+
+Latency, streaming speed and error rates come from ``STUB_*`` environment
+variables or can be changed at runtime through :data:`stub_config`. Chat
+usage reports ``cached_tokens`` the way OpenAI's prompt caching does: the
+longest prefix shared with a recent prompt, from ``cache_min_tokens`` up in
+128-token steps (4 characters per token). Run it
+standalone with ``python -m benchmarks.stub_openai`` or start it in a
+background thread with :func:`serve_in_thread`.
+"""
+import asyncio
+import base64
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# 1x1 transparent PNG.
+PNG_B64 = base64.b64encode(
+    bytes.fromhex(
+        "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+        "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+    )
+).decode()
+
+
+@dataclass
+class StubConfig:
+    latency: float = float(os.getenv("STUB_LATENCY", "0.5"))
+    # Uniform jitter added to `latency`, in seconds.
+    jitter: float = float(os.getenv("STUB_JITTER", "0"))
+    token_delay: float = float(os.getenv("STUB_TOKEN_DELAY", "0.01"))
+    # Fraction of requests answered with 429 (with `retry_after`) or 500.
+    rate_limit_rate: float = float(os.getenv("STUB_RATE_LIMIT_RATE", "0"))
+    error_rate: float = float(os.getenv("STUB_ERROR_RATE", "0"))
+    retry_after: str = os.getenv("STUB_RETRY_AFTER", "0.1")
+    reply: str = "- Topic\n  - Branch\n    - Leaf"
+    # Shortest prefix (in tokens) served from the simulated prompt cache.
+    cache_min_tokens: int = int(os.getenv("STUB_CACHE_MIN_TOKENS", "1024"))
+    recent_prompts: deque = field(default_factory=lambda: deque(maxlen=256))
+    # Request bodies seen by the stub, when `record` is on.
+    record: bool = False
+    requests: list[dict] = field(default_factory=list)
+
+
+stub_config = StubConfig()
+
+app = FastAPI()
+
+
+async def _delay() -> None:
+    await asyncio.sleep(stub_config.latency + random.uniform(0, stub_config.jitter))
+
+
+@app.middleware("http")
+async def inject_errors(request: Request, call_next):
+    roll = random.random()
+    if roll < stub_config.rate_limit_rate:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+            headers={"retry-after": stub_config.retry_after},
+        )
+    if roll < stub_config.rate_limit_rate + stub_config.error_rate:
+        return JSONResponse(status_code=500, content={"error": {"message": "Stub failure", "type": "server_error"}})
+    if stub_config.record:
+        stub_config.requests.append({"path": request.url.path, "body": json.loads(await request.body() or b"{}")})
+    return await call_next(request)
+
+
+def _cached_tokens(prompt: str) -> int:
+    shared = max((len(os.path.commonprefix([prompt, seen])) for seen in stub_config.recent_prompts), default=0)
+    stub_config.recent_prompts.append(prompt)
+    tokens = shared // 4
+    return tokens // 128 * 128 if tokens >= stub_config.cache_min_tokens else 0
+
+
+def _usage(body: dict, completion_tokens: int) -> dict:
+    messages = body.get("messages", [])
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    prompt = "".join(f"<{m.get('role')}>{m.get('content', '')}" for m in messages)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": _cached_tokens(prompt)},
+    }
+
+
+async def _stream_chat(body: dict):
+    def chunk(delta: dict, finish_reason=None, usage=None) -> str:
+        payload = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if usage is None else [],
+            "usage": usage,
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    tokens = stub_config.reply.split(" ")
+    yield chunk({"role": "assistant", "content": ""})
+    for i, token in enumerate(tokens):
+        await asyncio.sleep(stub_config.token_delay)
+        yield chunk({"content": token if i == 0 else f" {token}"})
+    yield chunk({}, finish_reason="stop")
+    yield chunk({}, usage=_usage(body, len(tokens)))
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: dict):
+    await _delay()
+    if body.get("stream"):
+        return StreamingResponse(_stream_chat(body), media_type="text/event-stream")
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": stub_config.reply},
+        }],
+        "usage": _usage(body, len(stub_config.reply) // 4),
+    }
+
+
+@app.post("/v1/images/generations")
+async def images_generations(body: dict):
+    await _delay()
+    return {"created": int(time.time()), "data": [{"b64_json": PNG_B64}]}
+
+
+@app.post("/v1/embeddings")
+async def embeddings(body: dict):
+    await _delay()
+    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    dim = body.get("dimensions", 512)
+    data = []
+    for index, text in enumerate(inputs):
+        rng = random.Random(text)
+        data.append({"object": "embedding", "index": index, "embedding": [rng.uniform(-1, 1) for _ in range(dim)]})
+    tokens = sum(len(text) for text in inputs) // 4
+    return {"object": "list", "data": data, "model": body["model"], "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+
+
+def serve_app_in_thread(asgi_app, port: int) -> uvicorn.Server:
+    """Serve an ASGI app on localhost from a daemon thread and wait until it is up."""
+    server = uvicorn.Server(uvicorn.Config(asgi_app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def serve_in_thread(port: int = 8765) -> uvicorn.Server:
+    return serve_app_in_thread(app, port)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=8765)
@@ -0,0 +1,295 @@
+"""End-to-end benchmark suite: HTTP scenarios against the local OpenAI stub, parser microbenchmarks and cold start.
+
+The app and the stub are served by uvicorn in background threads of this
+process and driven over real HTTP, so streaming responses are measured as a
+client sees them. Each scenario runs `--requests` requests from
+`--concurrency` closed-loop clients and reports p50/p95/p99 latency,
+throughput and RSS. Results are written as JSON; pass an earlier run as
+`--baseline` to fail on regressions. Cold start (import and boot time,
+with an import-time breakdown) runs in fresh interpreters, see
+benchmarks.startup; response encoding and compression of MindMapRead
+payloads, see benchmarks.serialization. Install requirements-bench.txt
+first (uvicorn for the stub, aiosqlite for the database fallback).
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --baseline bench.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+from benchmarks.harness import STUB_PORT, configure_environment, latency_summary, peak_rss_mib, rss_mib
+
+APP_PORT = 8766
+SECTIONS = ("http", "parsers", "serialization", "startup")
+
+# Metrics compared against a baseline, and whether higher values are better.
+REGRESSION_METRICS = {
+    "latency.p50": False,
+    "latency.p95": False,
+    "ttft.p95": False,
+    "throughput_rps": True,
+    "seconds": False,
+}
+
+
+def _material(i: int) -> str:
+    # Distinct materials so request coalescing does not merge the load.
+    return f"Lecture notes #{i}: photosynthesis converts light energy into chemical energy."
+
+
+async def _mind_map(client, i: int) -> float | None:
+    response = await client.post("/api/mindmap/generate", json={"material": _material(i)})
+    response.raise_for_status()
+    return None
+
+
+async def _mind_map_local(client, i: int) -> float | None:
+    response = await client.post(
+        "/api/mindmap/generate",
+        json={"material": _material(i), "renderer": "local", "image_format": "svg"},
+    )
+    response.raise_for_status()
+    return None
+
+
+async def _homework(client, i: int) -> float | None:
+    response = await client.post("/api/homework/generate", json={"material": _material(i)})
+    response.raise_for_status()
+    return None
+
+
+async def _chat_stream(client, i: int) -> float | None:
+    """Returns the time to the first token frame."""
+    start = time.perf_counter()
+    ttft = None
+    body = {"messages": [{"role": "user", "content": f"Explain osmosis, take {i}"}]}
+    async with client.stream("POST", "/api/chat/stream", json=body) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if ttft is None and line == "event: token":
+                ttft = time.perf_counter() - start
+    return ttft
+
+
+SCENARIOS: dict[str, Callable[..., Awaitable[float | None]]] = {
+    "mind_map": _mind_map,
+    "mind_map_local": _mind_map_local,
+    "homework": _homework,
+    "chat_stream": _chat_stream,
+}
+
+
+async def run_scenario(name: str, base_url: str, concurrency: int, requests: int) -> dict:
+    import httpx
+
+    scenario = SCENARIOS[name]
+    latencies: list[float] = []
+    ttfts: list[float] = []
+    errors = 0
+    issued = 0
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        await scenario(client, -1)  # warm-up
+
+        async def worker() -> None:
+            nonlocal issued, errors
+            while issued < requests:
+                i = issued
+                issued += 1
+                start = time.perf_counter()
+                try:
+                    ttft = await scenario(client, i)
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if ttft is not None:
+                    ttfts.append(ttft)
+
+        rss_before = rss_mib()
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    result = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "latency": latency_summary(latencies),
+        "rss_mib": {"before": rss_before, "after": rss_mib(), "peak": peak_rss_mib()},
+    }
+    if ttfts:
+        result["ttft"] = latency_summary(ttfts)
+    return result
+
+
+def run_http(args) -> dict:
+    from benchmarks.stub_openai import serve_app_in_thread, serve_in_thread, stub_config
+
+    stub_config.latency = args.latency
+    stub_config.jitter = args.jitter
+    stub_config.token_delay = args.token_delay
+    stub_config.error_rate = args.error_rate
+    stub_config.rate_limit_rate = args.rate_limit_rate
+
+    from app.main import app
+
+    stub = serve_in_thread(STUB_PORT)
+    server = serve_app_in_thread(app, APP_PORT)
+    results = {}
+    try:
+        for name in args.scenarios:
+            print(f"scenario {name} ...", file=sys.stderr)
+            results[name] = asyncio.run(
+                run_scenario(name, f"http://127.0.0.1:{APP_PORT}", args.concurrency, args.requests)
+            )
+    finally:
+        server.should_exit = True
+        stub.should_exit = True
+    return results
+
+
+def run_parsers(args) -> dict:
+    from app.utils.file_parser import PARSERS
+    from benchmarks.synthetic_docs import write_docx, write_markdown, write_pdf, write_txt
+
+    writers = {
+        "pdf": lambda path: write_pdf(path, pages=args.pdf_pages),
+        "docx": lambda path: write_docx(path, paragraphs=args.paragraphs),
+        "md": lambda path: write_markdown(path, paragraphs=args.paragraphs),
+        "txt": lambda path: write_txt(path, paragraphs=args.paragraphs),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension, write in writers.items():
+            print(f"parser {extension} ...", file=sys.stderr)
+            path = os.path.join(tmp, f"corpus.{extension}")
+            write(path)
+            size = os.path.getsize(path)
+            parser = PARSERS[extension]
+
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                text = parser.parse(path)
+                timings.append(time.perf_counter() - start)
+
+            tracemalloc.start()
+            parser.parse(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            seconds = statistics.median(timings)
+            results[extension] = {
+                "file_bytes": size,
+                "chars": len(text),
+                "seconds": seconds,
+                "mib_per_second": size / 2**20 / seconds,
+                "peak_traced_mib": peak / 2**20,
+            }
+    return results
+
+
+def _flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Metrics that got worse than the baseline by more than `tolerance` (relative)."""
+    regressions = []
+    old = _flatten({section: baseline.get(section, {}) for section in SECTIONS})
+    new = _flatten({section: current.get(section, {}) for section in SECTIONS})
+    for path, value in new.items():
+        metric = next((m for m in REGRESSION_METRICS if path.endswith(f".{m}")), None)
+        if metric is None or not old.get(path):
+            continue
+        change = (value - old[path]) / old[path]
+        if REGRESSION_METRICS[metric]:
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{path}: {old[path]:.4g} -> {value:.4g} ({change:+.0%} worse)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub response latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="uniform stub latency jitter (s)")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="delay between streamed tokens (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of stub 429 responses")
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--skip-parsers", action="store_true")
+    parser.add_argument("--skip-serialization", action="store_true")
+    parser.add_argument("--skip-startup", action="store_true")
+    parser.add_argument("--pdf-pages", type=int, default=100)
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    configure_environment()
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+    }
+    if not args.skip_http:
+        results["http"] = run_http(args)
+    if not args.skip_parsers:
+        results["parsers"] = run_parsers(args)
+    if not args.skip_serialization:
+        from benchmarks.serialization import measure as measure_serialization
+
+        print("serialization ...", file=sys.stderr)
+        # Microsecond timings need many more repetitions than the parsers.
+        results["serialization"] = measure_serialization([50, 500, 5000], repeat=50)
+    if not args.skip_startup:
+        from benchmarks.startup import measure
+
+        print("startup ...", file=sys.stderr)
+        results["startup"] = measure(args.repeat)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({key: results[key] for key in SECTIONS if key in results}, indent=2))
+    print(f"results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
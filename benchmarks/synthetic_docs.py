@@ -0,0 +1,100 @@
+"""Generators for synthetic learning materials used by the benchmarks."""
+import random
+
+WORDS = (
+    "entropy gradient lattice theorem vector matrix protein enzyme market demand "
+    "supply photosynthesis momentum inertia recursion algorithm compiler syntax "
+    "semantics democracy revolution empire climate erosion glacier molecule"
+).split()
+
+
+def paragraph(rng: random.Random, words: int = 60) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def write_pdf(path: str, pages: int, lines_per_page: int = 40, seed: int = 0) -> None:
+    """Write a text-only PDF with Helvetica lines on every page."""
+    rng = random.Random(seed)
+    objects: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # pages tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for _ in range(pages):
+        lines = [" ".join(rng.choice(WORDS) for _ in range(10)) for _ in range(lines_per_page)]
+        body = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        stream = body.encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path: str, paragraphs: int, seed: int = 0) -> None:
+    from docx import Document
+
+    rng = random.Random(seed)
+    document = Document()
+    for index in range(paragraphs):
+        if index % 10 == 0:
+            document.add_heading(f"Section {index // 10 + 1}", level=1)
+        document.add_paragraph(paragraph(rng))
+    document.save(path)
+
+
+def write_markdown(path: str, paragraphs: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for index in range(paragraphs):
+            if index % 10 == 0:
+                f.write(f"# Section {index // 10 + 1}\n\n")
+            f.write(f"{paragraph(rng)}\n\n")
+            if index % 5 == 4:
+                f.write("".join(f"- {rng.choice(WORDS)} {rng.choice(WORDS)}\n" for _ in range(3)) + "\n")
+
+
+def write_txt(path: str, paragraphs: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("\n\n".join(paragraph(rng) for _ in range(paragraphs)))
+
+
+def mind_map_markdown(nodes: int, branching: int = 5, seed: int = 0) -> str:
+    """A nested Markdown list of `nodes` items, shaped like the mind map prompt's output."""
+    rng = random.Random(seed)
+    lines = []
+    # Breadth-first numbering: item i hangs under item (i - 1) // branching.
+    depths = [0]
+    for i in range(1, nodes):
+        depths.append(depths[(i - 1) // branching] + 1)
+    order = sorted(range(nodes), key=lambda i: _path(i, branching))
+    for i in order:
+        label = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))).capitalize()
+        lines.append(f"{'  ' * depths[i]}- {label}")
+    return "\n".join(lines)
+
+
+def _path(i: int, branching: int) -> list[int]:
+    path = []
+    while i:
+        path.append(i)
+        i = (i - 1) // branching
+    return path[::-1]
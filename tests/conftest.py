@@ -0,0 +1,45 @@
+import sys
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from benchmarks.stub_openai import app as stub_app
+from benchmarks.stub_openai import stub_config
+
+
+def _stub_client() -> AsyncOpenAI:
+    # A fresh client per call keeps connections off closed event loops between tests.
+    return AsyncOpenAI(
+        api_key="stub",
+        base_url="http://stub/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=stub_app)),
+    )
+
+
+@pytest.fixture
+def stub_client():
+    """Factory for an OpenAI client talking to the stub."""
+    return _stub_client
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """Route every OpenAI call site to the local stub, in-process, with recording on."""
+    import app.main  # noqa: F401  (imports every service, so each call site gets patched)
+
+    monkeypatch.setattr(stub_config, "latency", 0.0)
+    monkeypatch.setattr(stub_config, "jitter", 0.0)
+    monkeypatch.setattr(stub_config, "token_delay", 0.0)
+    monkeypatch.setattr(stub_config, "rate_limit_rate", 0.0)
+    monkeypatch.setattr(stub_config, "error_rate", 0.0)
+    monkeypatch.setattr(stub_config, "record", True)
+    stub_config.requests.clear()
+    stub_config.recent_prompts.clear()
+
+    for name, module in list(sys.modules.items()):
+        if name.startswith("app.") and hasattr(module, "get_openai_client"):
+            monkeypatch.setattr(module, "get_openai_client", _stub_client)
+    yield stub_config
+    stub_config.requests.clear()
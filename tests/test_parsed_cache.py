@@ -0,0 +1,30 @@
+from app.utils.parsed_cache import ParsedDocumentCache
+
+
+def test_same_content_keeps_one_entry_per_parser(tmp_path):
+    cache = ParsedDocumentCache(str(tmp_path / "cache"))
+    content = "# Title\n\nBody text\n"
+    (tmp_path / "notes.txt").write_text(content)
+    (tmp_path / "notes.md").write_text(content)
+
+    as_txt, cached_txt = cache.load(str(tmp_path / "notes.txt"))
+    as_md, cached_md = cache.load(str(tmp_path / "notes.md"))
+
+    assert (cached_txt, cached_md) == (False, False)
+    assert as_txt.sha256 == as_md.sha256
+    assert cache.get(as_txt.sha256, "txt") == as_txt
+    assert cache.get(as_md.sha256, "md") == as_md
+    assert sorted(cache.parsers(as_txt.sha256)) == ["md", "txt"]
+    assert cache.load(str(tmp_path / "notes.txt")) == (as_txt, True)
+
+
+def test_purge_removes_entries_without_parser_key(tmp_path):
+    cache = ParsedDocumentCache(str(tmp_path / "cache"))
+    (tmp_path / "notes.txt").write_text("text")
+    doc, _ = cache.load(str(tmp_path / "notes.txt"))
+    legacy = tmp_path / "cache" / doc.sha256[:2] / f"{doc.sha256}.json"
+    legacy.write_text("{}")
+
+    assert cache.purge_stale() == 1
+    assert not legacy.exists()
+    assert cache.get(doc.sha256, "txt") == doc
@@ -0,0 +1,73 @@
+import asyncio
+from uuid import uuid4
+
+from app.dto.chat import ChatMessage, ChatRequest
+from app.prompts.assembly import SOCRATIC, assemble_messages, request_options, user_message
+from app.services import chat_service
+from app.services.session_service import SessionState, Turn, session_store
+
+
+def _chat_messages(contents: list[str], use_materials: bool = False) -> list[dict]:
+    roles = ["user", "assistant"]
+    messages = [ChatMessage(role=roles[i % 2], content=content) for i, content in enumerate(contents)]
+    request = ChatRequest(messages=messages, mode="socratic", use_materials=use_materials)
+    return asyncio.run(chat_service._build_messages(request))
+
+
+def test_assemble_messages_orders_from_most_to_least_stable():
+    history = [user_message("earlier question"), {"role": "assistant", "content": "earlier answer"}]
+    messages = assemble_messages(
+        SOCRATIC,
+        stable=["SUMMARY", ""],
+        history=history,
+        turn=[user_message("new question")],
+    )
+
+    assert messages == [
+        {"role": "system", "content": SOCRATIC.text},
+        {"role": "system", "content": "SUMMARY"},
+        *history,
+        {"role": "user", "content": "new question"},
+    ]
+
+
+def test_request_options_route_by_prompt_id():
+    assert request_options(SOCRATIC) == {"prompt_cache_key": SOCRATIC.id}
+    assert SOCRATIC.id.startswith("socratic@")
+
+
+def test_chat_turn_starts_with_previous_request():
+    first = _chat_messages(["Q1"])
+    second = _chat_messages(["Q1", "A1", "Q2"])
+
+    assert second[:len(first)] == first
+
+
+def test_retrieved_material_goes_before_the_question(monkeypatch):
+    async def context(question: str) -> dict:
+        return {"role": "system", "content": f"RELEVANT MATERIAL:\n\n{question}"}
+
+    monkeypatch.setattr(chat_service, "material_context_message", context)
+    plain = _chat_messages(["Q1", "A1", "Q2"])
+    with_context = _chat_messages(["Q1", "A1", "Q2"], use_materials=True)
+
+    assert with_context[:len(plain) - 1] == plain[:-1]
+    assert with_context[-2] == {"role": "system", "content": "RELEVANT MATERIAL:\n\nQ2"}
+    assert with_context[-1] == plain[-1]
+
+
+def test_session_turn_starts_with_previous_request():
+    state = SessionState(id=uuid4(), mode="socratic")
+    first = session_store.build_messages(state, "Q1")
+    state.turns = [Turn(1, "user", "Q1", 1), Turn(2, "assistant", "A1", 1)]
+    state.turn_count = 2
+    second = session_store.build_messages(state, "Q2")
+
+    assert second[:len(first)] == first
+    assert second[-1] == user_message("Q2")
+
+
+def test_chat_and_session_share_the_static_prefix():
+    state = SessionState(id=uuid4(), mode="socratic")
+
+    assert session_store.build_messages(state, "Q1") == _chat_messages(["Q1"])
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.dto.chat import ChatMessage, ChatRequest
+from app.prompts.assembly import HOMEWORK, SOCRATIC
+from app.services.chat_service import stream_chat
+from app.services.homework_service import HOMEWORK_MODEL, generate_homework
+
+
+def _serialized(messages: list[dict]) -> bytes:
+    return json.dumps(messages, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _cached_tokens(model: str) -> float:
+    return REGISTRY.get_sample_value("openai_tokens_total", {"model": model, "kind": "cached_prompt"}) or 0.0
+
+
+def _bodies(stub) -> list[dict]:
+    return [request["body"] for request in stub.requests if request["path"].endswith("/chat/completions")]
+
+
+@pytest.fixture
+def stub_cache(stub, monkeypatch):
+    # The static prompts are below OpenAI's 1024-token minimum; the stub caches from 128.
+    monkeypatch.setattr(stub, "cache_min_tokens", 128)
+    return stub
+
+
+def test_homework_calls_share_static_prefix_and_count_cached_tokens(stub_cache):
+    before = _cached_tokens(HOMEWORK_MODEL)
+
+    async def run() -> None:
+        await generate_homework("Photosynthesis converts light energy into chemical energy.")
+        await generate_homework("Respiration releases energy from glucose.")
+
+    asyncio.run(run())
+    first, second = _bodies(stub_cache)
+
+    assert _serialized(first["messages"][:1]) == _serialized(second["messages"][:1])
+    assert first["messages"][1:] != second["messages"][1:]
+    assert first["prompt_cache_key"] == second["prompt_cache_key"] == HOMEWORK.id
+    assert _cached_tokens(HOMEWORK_MODEL) > before
+
+
+def test_chat_turn_resends_previous_request_byte_for_byte(stub_cache):
+    before = _cached_tokens("gpt-4.1-mini")
+
+    async def turn(history: list[ChatMessage]) -> str:
+        reply = ""
+        async for frame in stream_chat(ChatRequest(messages=history, mode="socratic")):
+            if frame.startswith("event: token"):
+                reply += json.loads(frame.split("data: ", 1)[1])["delta"]
+        return reply
+
+    async def run() -> None:
+        history = [ChatMessage(role="user", content="Why do leaves change colour?")]
+        history.append(ChatMessage(role="assistant", content=await turn(history)))
+        history.append(ChatMessage(role="user", content="What happens to chlorophyll?"))
+        await turn(history)
+
+    asyncio.run(run())
+    first, second = _bodies(stub_cache)
+
+    assert _serialized(second["messages"]).startswith(_serialized(first["messages"])[:-1])
+    assert first["prompt_cache_key"] == second["prompt_cache_key"] == SOCRATIC.id
+    assert _cached_tokens("gpt-4.1-mini") > before
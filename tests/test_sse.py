@@ -0,0 +1,55 @@
+import asyncio
+
+from app.utils.sse import stream_with_heartbeat
+
+
+class _Request:
+    """Reports a disconnect after `frames` checks."""
+
+    def __init__(self, frames: int):
+        self.checks = 0
+        self.frames = frames
+
+    async def is_disconnected(self) -> bool:
+        self.checks += 1
+        return self.checks > self.frames
+
+
+def test_disconnect_with_full_buffer_closes_source():
+    closed = asyncio.Event()
+
+    async def frames():
+        try:
+            for i in range(100):
+                yield f"data: {i}\n\n"
+        finally:
+            closed.set()
+
+    async def consume() -> list[str]:
+        stream = stream_with_heartbeat(_Request(frames=1), frames(), heartbeat=10, buffer=4)
+        received = []
+        async for frame in stream:
+            received.append(frame)
+            # Let the producer fill the buffer before the disconnect is noticed.
+            await asyncio.sleep(0.01)
+        return received
+
+    received = asyncio.run(asyncio.wait_for(consume(), timeout=2))
+
+    assert received == ["data: 0\n\n"]
+    assert closed.is_set()
+
+
+def test_source_error_becomes_error_event():
+    async def frames():
+        yield "data: 0\n\n"
+        raise RuntimeError("upstream broke")
+
+    async def consume() -> list[str]:
+        return [frame async for frame in stream_with_heartbeat(_Request(frames=100), frames(), heartbeat=10)]
+
+    received = asyncio.run(asyncio.wait_for(consume(), timeout=2))
+
+    assert received[0] == "data: 0\n\n"
+    assert received[1].startswith("event: error\n")
+    assert "upstream broke" in received[1]
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import upstream as upstream_module
+from app.services.upstream import UpstreamScheduler, UpstreamUnavailableError
+
+MODEL = "gpt-4.1-mini"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the scheduler's back-off delays instead of waiting them out."""
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record(delay, *args, **kwargs):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(upstream_module.asyncio, "sleep", record)
+    return delays
+
+
+def _call(scheduler: UpstreamScheduler, stub_client):
+    async def run():
+        client = stub_client()
+        return await scheduler.call(
+            MODEL,
+            lambda: client.chat.completions.create(model=MODEL, messages=[{"role": "user", "content": "hi"}]),
+        )
+
+    return asyncio.run(run())
+
+
+def test_rate_limits_wait_for_retry_after_and_slow_down(stub, stub_client, sleeps, monkeypatch):
+    monkeypatch.setattr(stub, "rate_limit_rate", 1.0)
+    monkeypatch.setattr(stub, "retry_after", "7")
+    scheduler = UpstreamScheduler()
+
+    with pytest.raises(UpstreamUnavailableError):
+        _call(scheduler, stub_client)
+
+    retries = settings.upstream.UPSTREAM_MAX_RETRIES
+    backoffs = [delay for delay in sleeps if delay]
+    assert len(backoffs) == retries
+    assert all(delay >= 7 for delay in backoffs)
+    stats = scheduler.snapshot()[MODEL]
+    assert stats["rate_limited"] == retries + 1
+    # 429s slow the buckets down (AIMD) but never trip the breaker.
+    assert stats["breaker"] == "closed"
+    assert stats["rpm_rate"] < settings.upstream.UPSTREAM_LIMITS[MODEL]["rpm"]
+
+
+def test_success_after_rate_limits_speeds_back_up(stub, stub_client, sleeps, monkeypatch):
+    scheduler = UpstreamScheduler()
+    monkeypatch.setattr(stub, "rate_limit_rate", 1.0)
+    with pytest.raises(UpstreamUnavailableError):
+        _call(scheduler, stub_client)
+    slowed = scheduler.snapshot()[MODEL]["rpm_rate"]
+
+    monkeypatch.setattr(stub, "rate_limit_rate", 0.0)
+    response = _call(scheduler, stub_client)
+
+    assert response.choices[0].message.content == stub.reply
+    assert scheduler.snapshot()[MODEL]["rpm_rate"] > slowed
+
+
+def test_repeated_server_errors_open_the_breaker(stub, stub_client, sleeps, monkeypatch):
+    monkeypatch.setattr(stub, "error_rate", 1.0)
+    monkeypatch.setattr(settings.upstream, "UPSTREAM_BREAKER_FAILURES", 3)
+    scheduler = UpstreamScheduler()
+
+    with pytest.raises(UpstreamUnavailableError):
+        _call(scheduler, stub_client)
+    stats = scheduler.snapshot()[MODEL]
+    assert stats["breaker"] == "open"
+    # The breaker opened at the third failure and rejected the remaining retries.
+    assert stats["failures"] == 3
+    assert stats["rejected"] == 1
+
+    requests = len(stub.requests)
+    with pytest.raises(UpstreamUnavailableError) as error:
+        _call(scheduler, stub_client)
+    assert error.value.retry_after > 0
+    assert scheduler.snapshot()[MODEL]["rejected"] == 2
+    assert len(stub.requests) == requests